@@ -0,0 +1 @@
+"""Benchmarks for integration_infinitenetworks, run with `python -m benchmarks`."""
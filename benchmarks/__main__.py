@@ -0,0 +1,54 @@
+"""Run the integration_infinitenetworks benchmarks."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from . import (
+    bench_client,
+    bench_fleet,
+    bench_mfa,
+    bench_replay,
+    bench_soak,
+    bench_startup,
+)
+from .harness import format_results
+
+BENCHMARKS = {
+    "client": bench_client,
+    "fleet": bench_fleet,
+    "mfa": bench_mfa,
+    "replay": bench_replay,
+    "soak": bench_soak,
+    "startup": bench_startup,
+}
+
+
+def main() -> int:
+    """Parse the arguments and run the selected benchmark."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--json", help="also write the results to this file")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    for name, module in BENCHMARKS.items():
+        module.add_arguments(subparsers.add_parser(name, help=module.__doc__))
+    args = parser.parse_args()
+
+    results = asyncio.run(BENCHMARKS[args.benchmark].run(args))
+    print(format_results(results))
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps([result.as_dict() for result in results], indent=2),
+            encoding="utf-8",
+        )
+    failures = [failure for result in results for failure in result.failures]
+    for failure in failures:
+        print(f"FAILED {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Benchmarks of the SSO login and API polling against the mock portal."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from custom_components.integration_infinitenetworks.cache import InfinteResponseCache
+
+from .harness import BenchmarkResult, measure, mock_portal, portal_client, refresh
+from .mock_portal import MockPortalConfig
+
+if TYPE_CHECKING:
+    import argparse
+
+
+async def bench_cold_login(
+    config: MockPortalConfig, iterations: int
+) -> BenchmarkResult:
+    """Measure the first refresh of a new client, including the full login."""
+    async with mock_portal(config) as portal:
+
+        async def run() -> None:
+            async with portal_client(portal) as client:
+                await refresh(client)
+
+        return await measure(BenchmarkResult("cold login"), iterations, run, portal)
+
+
+async def bench_warm_poll(
+    config: MockPortalConfig,
+    iterations: int,
+    name: str = "warm poll",
+    response_cache: InfinteResponseCache | None = None,
+) -> BenchmarkResult:
+    """Measure a refresh of a client that is already logged in."""
+    async with (
+        mock_portal(config) as portal,
+        portal_client(
+            portal, response_cache=response_cache or InfinteResponseCache(ttls={})
+        ) as client,
+    ):
+        await refresh(client)
+        return await measure(
+            BenchmarkResult(name), iterations, lambda: refresh(client), portal
+        )
+
+
+async def run(args: argparse.Namespace) -> list[BenchmarkResult]:
+    """Run the client benchmarks."""
+    config = MockPortalConfig(
+        latency=args.latency,
+        failure_rate=args.failure_rate,
+        etag=args.etag,
+    )
+    parallel_config = MockPortalConfig(
+        clients=args.clients,
+        services_per_client=args.services,
+        latency=args.latency,
+        failure_rate=args.failure_rate,
+        etag=args.etag,
+    )
+    return [
+        await bench_cold_login(config, args.iterations),
+        await bench_warm_poll(config, args.iterations),
+        # As the coordinator right after the state watcher or a diagnostics download
+        await bench_warm_poll(
+            config, args.iterations, "fresh poll", InfinteResponseCache()
+        ),
+        await bench_warm_poll(
+            parallel_config,
+            args.iterations,
+            f"warm poll {args.clients}x{args.services} services",
+        ),
+    ]
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the client benchmark arguments."""
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=2)
+    parser.add_argument("--services", type=int, default=10, help="per client")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--etag", action="store_true", help="serve ETags")
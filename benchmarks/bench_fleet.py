@@ -0,0 +1,114 @@
+"""Benchmarks of fleet mode polling many services a slot at a time."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from custom_components.integration_infinitenetworks.fleet import FleetScheduler
+from custom_components.integration_infinitenetworks.resilience import TokenBucket
+
+from .harness import BenchmarkResult, measure, mock_portal, portal_client, refresh
+from .mock_portal import MockPortalConfig
+
+if TYPE_CHECKING:
+    import argparse
+
+    from custom_components.integration_infinitenetworks.api import (
+        InfinteNetworksApiClient,
+    )
+
+
+async def bench_all_at_once(
+    config: MockPortalConfig, iterations: int, concurrency: int
+) -> BenchmarkResult:
+    """Measure polling every service in one refresh, as without fleet mode."""
+    async with (
+        mock_portal(config) as portal,
+        portal_client(portal, max_concurrency=concurrency) as client,
+    ):
+        services = await client.async_get_services()
+        await refresh(client)
+        return await measure(
+            BenchmarkResult("all at once", len(services)),
+            iterations,
+            lambda: refresh(client),
+            portal,
+        )
+
+
+async def bench_fleet(  # noqa: PLR0913
+    config: MockPortalConfig,
+    iterations: int,
+    concurrency: int,
+    slot_size: int,
+    rate: float,
+    *,
+    full_round: bool,
+) -> BenchmarkResult:
+    """Measure a fleet tick, or the ticks of a round over every service."""
+    rate_limiter = TokenBucket(rate, concurrency) if rate else None
+    async with (
+        mock_portal(config) as portal,
+        portal_client(
+            portal, max_concurrency=concurrency, rate_limiter=rate_limiter
+        ) as client,
+    ):
+        services = await client.async_get_services()
+        scheduler = FleetScheduler(slot_size)
+        slot_count = scheduler.slot_count(services)
+        ticks = slot_count if full_round else 1
+        polled: dict[int, object] = {}
+
+        async def tick(client: InfinteNetworksApiClient) -> None:
+            details, _failures = await scheduler.async_poll(
+                client, scheduler.due(await client.async_get_services(), polled)
+            )
+            polled.update(details)
+
+        async def run() -> None:
+            for _ in range(ticks):
+                await tick(client)
+
+        # The first tick polls every service, as after a restart
+        await tick(client)
+        name = "fleet round" if full_round else "fleet tick"
+        items = len(services) if full_round else -(-len(services) // slot_count)
+        return await measure(BenchmarkResult(name, items), iterations, run, portal)
+
+
+async def run(args: argparse.Namespace) -> list[BenchmarkResult]:
+    """Run the fleet benchmarks."""
+    config = MockPortalConfig(
+        clients=args.clients,
+        services_per_client=args.services,
+        latency=args.latency,
+        failure_rate=args.failure_rate,
+    )
+    return [
+        await bench_all_at_once(config, args.iterations, args.concurrency),
+        *[
+            await bench_fleet(
+                config,
+                args.iterations,
+                args.concurrency,
+                args.slot_size,
+                args.rate,
+                full_round=full_round,
+            )
+            for full_round in (False, True)
+        ],
+    ]
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the fleet benchmark arguments."""
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--services", type=int, default=100, help="per client")
+    parser.add_argument("--slot-size", type=int, default=25)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--rate", type=float, default=0.0, help="requests per second, 0 for no limit"
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
@@ -0,0 +1,125 @@
+"""Benchmarks of the MFA form token extraction and the import cost it avoids."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from custom_components.integration_infinitenetworks.mfa import (
+    MfaTokenScanner,
+    parse_mfa_token,
+)
+
+from .harness import BenchmarkResult, measure
+from .mock_portal import mfa_page
+
+if TYPE_CHECKING:
+    import argparse
+    from collections.abc import Callable
+
+TOKEN = "4pXo1-5QmHhXWJ0vV8o3c2Ewd6b1lK9dVEo3Lq6m2ZQ"  # noqa: S105 A fake form token
+
+# Modules any Home Assistant process has loaded before it imports the integration
+STANDARD_MODULES = ("asyncio", "logging", "re", "typing")
+HOME_ASSISTANT_MODULES = (
+    *STANDARD_MODULES,
+    "aiohttp",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.components.sensor",
+)
+
+IMPORTS = {
+    "import integration": (
+        "custom_components.integration_infinitenetworks.api",
+        HOME_ASSISTANT_MODULES,
+    ),
+    "import selectolax": ("selectolax.parser", STANDARD_MODULES),
+    "import pyotp": ("pyotp", STANDARD_MODULES),
+}
+
+IMPORT_TIMER = """
+import sys, time
+for module in sys.argv[2:]:
+    __import__(module)
+start = time.perf_counter()
+__import__(sys.argv[1])
+print(time.perf_counter() - start)
+"""
+
+
+def scan(page: bytes, chunk_size: int) -> str | None:
+    """Feed the page to a scanner the way it arrives from the network."""
+    scanner = MfaTokenScanner()
+    for start in range(0, len(page), chunk_size):
+        if (token := scanner.feed(page[start : start + chunk_size])) is not None:
+            return token
+    return None
+
+
+async def bench_extraction(
+    name: str, iterations: int, extract: Callable[[], str | None]
+) -> BenchmarkResult:
+    """Measure extracting the token from the page."""
+
+    async def run() -> None:
+        if extract() != TOKEN:
+            msg = f"{name} did not find the token"
+            raise AssertionError(msg)
+
+    return await measure(BenchmarkResult(name), iterations, run)
+
+
+async def bench_import(
+    name: str, module: str, preload: tuple[str, ...], iterations: int
+) -> BenchmarkResult:
+    """Measure importing a module in a fresh interpreter."""
+    result = BenchmarkResult(name)
+    for _ in range(iterations):
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-c",
+            IMPORT_TIMER,
+            module,
+            *preload,
+            cwd=Path(__file__).parents[1],
+            stdout=asyncio.subprocess.PIPE,
+        )
+        stdout, _stderr = await process.communicate()
+        if process.returncode:
+            msg = f"Importing {module} failed"
+            raise RuntimeError(msg)
+        result.latencies.append(float(stdout))
+    return result
+
+
+async def run(args: argparse.Namespace) -> list[BenchmarkResult]:
+    """Run the MFA benchmarks."""
+    text = mfa_page(TOKEN, args.rows)
+    page = text.encode()
+    results = [
+        await bench_extraction(
+            "scan token", args.iterations, lambda: scan(page, args.chunk_size)
+        ),
+        await bench_extraction(
+            "parse token", args.iterations, lambda: parse_mfa_token(text)
+        ),
+    ]
+    results.extend(
+        [
+            await bench_import(name, module, preload, args.import_iterations)
+            for name, (module, preload) in IMPORTS.items()
+        ]
+    )
+    return results
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the MFA benchmark arguments."""
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--import-iterations", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=200, help="of page padding")
+    parser.add_argument("--chunk-size", type=int, default=4096, help="bytes")
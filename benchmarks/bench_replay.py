@@ -0,0 +1,337 @@
+"""Benchmarks replaying recorded API traffic through the coordinator and sensors."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import re
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+from custom_components.integration_infinitenetworks.analytics import (
+    LineQualityAnalytics,
+)
+from custom_components.integration_infinitenetworks.api import (
+    InfinteCredentials,
+    InfinteHmac,
+    InfinteNetworksApiClient,
+)
+from custom_components.integration_infinitenetworks.cache import InfinteResponseCache
+from custom_components.integration_infinitenetworks.const import (
+    API_URL,
+    DOMAIN,
+    LOGGER,
+)
+from custom_components.integration_infinitenetworks.replay import (
+    FixtureWriter,
+    RecordingTransport,
+    ReplayTransport,
+    read_fixture,
+)
+from custom_components.integration_infinitenetworks.resilience import RetryPolicy
+from custom_components.integration_infinitenetworks.transport import create_session
+
+from .harness import (
+    BenchmarkResult,
+    MemoryCredentialStore,
+    measure,
+    mock_portal,
+    portal_client,
+    refresh,
+)
+from .mock_portal import MockPortalConfig
+
+if TYPE_CHECKING:
+    import argparse
+    from collections.abc import AsyncIterator
+
+    from custom_components.integration_infinitenetworks.replay import (
+        RecordedExchange,
+    )
+
+    from .mock_portal import MockPortal
+
+_SERVICES_PATH = re.compile(r"/api/incontrol/client/(\d+)/services")
+# Environment variables with the account to record from the live portal
+LIVE_CREDENTIALS = (
+    "INFINITE_NETWORKS_USERNAME",
+    "INFINITE_NETWORKS_PASSWORD",
+    "INFINITE_NETWORKS_MFA_SECRET",
+)
+
+
+def _vary_details(portal: MockPortal, rng: random.Random, update: int) -> None:
+    """Drift the line rates of every service, with the odd retrain."""
+    for service_id, payload in portal.details.items():
+        details = payload["details"]
+        changes: dict[str, object] = {
+            "actual_line_rate_down": max(
+                0, details["actual_line_rate_down"] + rng.randint(-2000, 1800)
+            ),
+            "actual_line_rate_up": max(
+                0, details["actual_line_rate_up"] + rng.randint(-200, 180)
+            ),
+        }
+        if rng.random() < 0.002:  # noqa: PLR2004
+            changes["last_status_change"] = (
+                datetime(2025, 1, 1, tzinfo=UTC) + timedelta(minutes=5 * update)
+            ).isoformat()
+        portal.set_details(service_id, **changes)
+
+
+async def record_mock(
+    path: Path, services: int, updates: int, interval: float
+) -> BenchmarkResult:
+    """Record updates of drifting services from the mock portal."""
+    result = BenchmarkResult("record", services)
+    rng = random.Random(services)  # noqa: S311
+    writer = FixtureWriter(path)
+    try:
+        async with (
+            mock_portal(MockPortalConfig(services_per_client=services)) as portal,
+            portal_client(
+                portal,
+                lambda session: RecordingTransport(session, writer, portal.api_url),
+            ) as client,
+        ):
+            for update in range(updates):
+                _vary_details(portal, rng, update)
+                start = time.perf_counter()
+                await refresh(client)
+                result.latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(interval)
+            result.requests = portal.requests.total()
+    finally:
+        writer.close()
+    return result
+
+
+async def record_live(path: Path, updates: int, interval: float) -> BenchmarkResult:
+    """Record updates of the account in the environment from the live portal."""
+    username, password, mfa_shared_secret = (
+        os.environ[name] for name in LIVE_CREDENTIALS
+    )
+    result = BenchmarkResult("record live")
+    writer = FixtureWriter(path)
+    try:
+        async with create_session(cookie_jar=aiohttp.CookieJar()) as session:
+            client = InfinteNetworksApiClient(
+                username=username,
+                password=password,
+                mfa_shared_secret=mfa_shared_secret,
+                session=session,
+                transport=RecordingTransport(session, writer, API_URL),
+            )
+            try:
+                for _ in range(updates):
+                    start = time.perf_counter()
+                    data = await refresh(client)
+                    result.latencies.append(time.perf_counter() - start)
+                    result.items_per_iteration = len(data)
+                    await asyncio.sleep(interval)
+            finally:
+                await client.async_close()
+    finally:
+        writer.close()
+    return result
+
+
+@asynccontextmanager
+async def replay_client(
+    exchanges: list[RecordedExchange], speed: float | None
+) -> AsyncIterator[InfinteNetworksApiClient]:
+    """Return a client served from the exchanges, without logging in."""
+    client_ids = sorted(
+        {
+            int(match[1])
+            for exchange in exchanges
+            if (match := _SERVICES_PATH.fullmatch(exchange.path))
+        }
+    )
+    # The SSO login is never recorded, so start from credentials that stay valid
+    store = MemoryCredentialStore()
+    expires = datetime.now(UTC) + timedelta(days=365)
+    store.credentials = InfinteCredentials(
+        hmac=InfinteHmac(
+            expires=expires.isoformat(),
+            user="replay",
+            hmac="replay",
+            expires_date=expires,
+        ),
+        client_ids=client_ids,
+        cookies=[],
+    )
+    async with aiohttp.ClientSession() as session:
+        client = InfinteNetworksApiClient(
+            username="replay",
+            password="",
+            mfa_shared_secret="",
+            session=session,
+            credential_store=store,
+            retry_policy=RetryPolicy(attempts=1),
+            transport=ReplayTransport(session, exchanges, speed),
+            # The recorded updates were minutes apart, longer than anything is fresh
+            response_cache=InfinteResponseCache(ttls={}),
+        )
+        try:
+            yield client
+        finally:
+            await client.async_close()
+
+
+async def bench_replay_client(
+    exchanges: list[RecordedExchange], iterations: int, speed: float | None
+) -> BenchmarkResult:
+    """Measure the API work of an update, served from the fixture."""
+    async with replay_client(exchanges, speed) as client:
+        services = await refresh(client)
+        return await measure(
+            BenchmarkResult("replay client", len(services)),
+            iterations,
+            lambda: refresh(client),
+        )
+
+
+async def bench_replay_sensors(
+    exchanges: list[RecordedExchange], iterations: int, speed: float | None
+) -> BenchmarkResult:
+    """Measure an update of the coordinator and every sensor of the services."""
+    # Imported here, so the other benchmarks run without Home Assistant
+    from homeassistant.core import HomeAssistant  # noqa: PLC0415
+
+    from custom_components.integration_infinitenetworks.coordinator import (  # noqa: PLC0415
+        InfinteNetworksDataUpdateCoordinator,
+    )
+    from custom_components.integration_infinitenetworks.history import (  # noqa: PLC0415
+        LineRateHistory,
+    )
+    from custom_components.integration_infinitenetworks.sensor import (  # noqa: PLC0415
+        ANALYTICS_ENTITY_DESCRIPTIONS,
+        ENTITY_DESCRIPTIONS,
+        HISTORY_ENTITY_DESCRIPTIONS,
+        InfinteNetworksAnalyticsSensor,
+        InfinteNetworksHistorySensor,
+        InfinteNetworksSensor,
+    )
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        async with replay_client(exchanges, speed) as client:
+            coordinator = InfinteNetworksDataUpdateCoordinator(
+                hass,
+                LOGGER,
+                name=DOMAIN,
+                min_interval=timedelta(minutes=5),
+                max_interval=timedelta(minutes=60),
+                always_update=False,
+            )
+            history = LineRateHistory()
+            # Only what the coordinator and sensors read from the config entry
+            coordinator.config_entry = SimpleNamespace(
+                entry_id="replay",
+                domain=DOMAIN,
+                title="replay",
+                pref_disable_polling=False,
+                runtime_data=SimpleNamespace(
+                    client=client,
+                    history=history,
+                    analytics=LineQualityAnalytics(history),
+                ),
+            )
+            await coordinator.async_refresh()
+
+            sensor_classes: list[tuple[type[InfinteNetworksSensor], Any]] = [
+                (InfinteNetworksSensor, ENTITY_DESCRIPTIONS),
+                (InfinteNetworksHistorySensor, HISTORY_ENTITY_DESCRIPTIONS),
+                (InfinteNetworksAnalyticsSensor, ANALYTICS_ENTITY_DESCRIPTIONS),
+            ]
+            sensors = [
+                sensor_class(coordinator, service, entity_description)
+                for service in coordinator.services
+                for sensor_class, entity_descriptions in sensor_classes
+                for entity_description in entity_descriptions
+            ]
+            # Added without an entity platform, the states are still written, but
+            # Home Assistant warns about every sensor
+            logging.getLogger("homeassistant.helpers.entity").setLevel(logging.ERROR)
+            for index, sensor in enumerate(sensors):
+                sensor.hass = hass
+                sensor.entity_id = f"sensor.{DOMAIN}_{index}"
+                await sensor.async_added_to_hass()
+
+            async def run() -> None:
+                await coordinator.async_refresh()
+                # Let the batched listener notification run
+                await asyncio.sleep(0)
+
+            try:
+                return await measure(
+                    BenchmarkResult("replay coordinator and sensors", len(sensors)),
+                    iterations,
+                    run,
+                )
+            finally:
+                await coordinator.async_shutdown()
+                await hass.async_stop(force=True)
+
+
+async def run(args: argparse.Namespace) -> list[BenchmarkResult]:
+    """Record a fixture if asked, then replay it."""
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(args.fixture or Path(directory, "fixture.jsonl.gz"))
+        if args.live:
+            results.append(await record_live(path, args.updates, args.interval))
+        elif args.record or not args.fixture:
+            results.append(
+                await record_mock(path, args.services, args.updates, args.interval)
+            )
+
+        exchanges = list(read_fixture(path))
+        speed = args.speed or None
+        # The first update fills the caches, the rest are split between the
+        # timed and the tracemalloc runs of each benchmark
+        details = [
+            exchange.path
+            for exchange in exchanges
+            if exchange.path.endswith("/details")
+        ]
+        updates = len(details) // max(len(set(details)), 1)
+        iterations = max(1, (updates - 1) // 2)
+        results.append(await bench_replay_client(exchanges, iterations, speed))
+        results.append(await bench_replay_sensors(exchanges, iterations, speed))
+    return results
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the replay benchmark arguments."""
+    parser.add_argument("--fixture", help="fixture to replay, or to record into")
+    parser.add_argument(
+        "--record", action="store_true", help="record the fixture from the mock portal"
+    )
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help="record the fixture from the live portal, with the account in "
+        + ", ".join(LIVE_CREDENTIALS),
+    )
+    parser.add_argument("--services", type=int, default=10, help="to record")
+    parser.add_argument("--updates", type=int, default=1000, help="to record")
+    parser.add_argument(
+        "--interval", type=float, default=0.0, help="seconds between recorded updates"
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=0.0,
+        help="replay latency speed-up, 1 for the recorded latency, 0 for none",
+    )
@@ -0,0 +1,292 @@
+"""Soak test of refreshes, hmac expiries and reloads, failing on resource growth."""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from custom_components.integration_infinitenetworks.api import (
+    InfinteNetworksApiClientError,
+)
+from custom_components.integration_infinitenetworks.const import HMAC_REFRESH_MARGIN
+
+from .harness import (
+    BenchmarkResult,
+    MemoryCredentialStore,
+    mock_portal,
+    portal_client,
+    refresh,
+)
+from .mock_portal import MockPortalConfig
+
+if TYPE_CHECKING:
+    import argparse
+
+    from custom_components.integration_infinitenetworks.api import (
+        InfinteNetworksApiClient,
+    )
+
+    from .mock_portal import MockPortal
+
+# Allocation sites with the most growth, listed when a budget is exceeded
+TOP_ALLOCATIONS = 10
+# The latencies and samples of the soak test itself are not the client's
+HARNESS_FILTERS = [
+    tracemalloc.Filter(inclusive=False, filename_pattern=__file__),
+    tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__),
+]
+
+
+@dataclass
+class SoakSample:
+    """The state of the process after a window of refreshes."""
+
+    traced_bytes: int
+    connections: int
+    tasks: int
+    snapshot: tracemalloc.Snapshot | None = None
+
+
+@dataclass
+class SoakBudgets:
+    """Growth from the first window to the end that fails the soak test."""
+
+    memory_kib: float
+    connections: int
+    tasks: int
+    # Ratio of the median refresh latency of the last window to the first
+    latency_ratio: float
+
+
+async def sample(portal: MockPortal) -> SoakSample:
+    """Collect the garbage, then sample memory, connections and tasks."""
+    # Let closed connections and finished tasks be noticed first
+    await asyncio.sleep(0.05)
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot().filter_traces(HARNESS_FILTERS)
+    return SoakSample(
+        traced_bytes=sum(trace.size for trace in snapshot.traces),
+        connections=portal.connections,
+        tasks=len(asyncio.all_tasks()) - 1,
+        snapshot=snapshot,
+    )
+
+
+@dataclass
+class SoakCounts:
+    """What the soak test did so far."""
+
+    errors: int = 0
+    reloads: int = 0
+    expiries: int = 0
+
+
+class SoakTest:
+    """Refresh, revoke the hmac and reload the client, sampling every window."""
+
+    def __init__(
+        self, portal: MockPortal, window: int, reload_every: int, expire_every: int
+    ) -> None:
+        """Initialize the soak test against a running portal."""
+        self.portal = portal
+        self.window = window
+        self.reload_every = reload_every
+        self.expire_every = expire_every
+        self.counts = SoakCounts()
+        self.results: list[BenchmarkResult] = []
+        self.first: SoakSample | None = None
+        self.last: SoakSample | None = None
+        self._done = 0
+        self._latencies: list[float] = []
+        self._requests = portal.requests.total()
+        # Reloads start from what the previous client stored, as after a restart
+        self._store = MemoryCredentialStore()
+
+    async def run(self, refreshes: int) -> SoakSample:
+        """Do the refreshes, reloading the client, and sample it closed."""
+        while self._done < refreshes:
+            async with portal_client(
+                self.portal, credential_store=self._store
+            ) as client:
+                for _ in range(min(self.reload_every, refreshes - self._done)):
+                    await self._refresh(client)
+            self.counts.reloads += 1
+        closed = await sample(self.portal)
+        self._append("closed", closed)
+        return closed
+
+    async def _refresh(self, client: InfinteNetworksApiClient) -> None:
+        """Do one refresh, revoking the hmac first when it is due."""
+        if self._done and self.expire_every and self._done % self.expire_every == 0:
+            self.portal.expire_hmacs()
+            self.counts.expiries += 1
+        start = time.perf_counter()
+        try:
+            await refresh(client)
+        except InfinteNetworksApiClientError:
+            # The coordinator retries on its next interval
+            self.counts.errors += 1
+        self._latencies.append(time.perf_counter() - start)
+        self._done += 1
+        if self._done % self.window == 0:
+            self.last = await sample(self.portal)
+            # The first window warms the caches and the login
+            self.first = self.first or self.last
+            self._append(
+                f"refreshes {self._done - len(self._latencies)}-{self._done}",
+                self.last,
+            )
+
+    def _append(self, name: str, state: SoakSample) -> None:
+        """Add a row for the refreshes since the last one and the state after."""
+        result = BenchmarkResult(
+            name,
+            latencies=self._latencies,
+            requests=self.portal.requests.total() - self._requests,
+        )
+        result.retained_bytes.append(
+            state.traced_bytes - (self.first.traced_bytes if self.first else 0)
+        )
+        result.gauges = {
+            "connections": state.connections,
+            "tasks": state.tasks,
+            **asdict(self.counts),
+        }
+        self.results.append(result)
+        self._latencies = []
+        self._requests = self.portal.requests.total()
+
+    def check(self, closed: SoakSample, budgets: SoakBudgets) -> list[str]:
+        """Return the budgets exceeded, listing the allocations that grew."""
+        first, last = self.first, self.last
+        if first is None or last is None or first is last:
+            return []
+        # The last window is sampled with the client open, like the first
+        failures = check_budgets(self.results[:-1], first, last, budgets)
+        # A closed client leaves nothing behind, whatever the budgets
+        if closed.connections:
+            failures.append(f"{closed.connections} connections open after closing")
+        if closed.tasks > first.tasks:
+            failures.append(f"{closed.tasks - first.tasks} tasks pending after closing")
+        if failures and first.snapshot and last.snapshot:
+            for statistic in last.snapshot.compare_to(first.snapshot, "lineno")[
+                :TOP_ALLOCATIONS
+            ]:
+                print(statistic)
+        return failures
+
+
+def check_budgets(
+    results: list[BenchmarkResult],
+    first: SoakSample,
+    last: SoakSample,
+    budgets: SoakBudgets,
+) -> list[str]:
+    """Return the budgets the growth from the first to the last sample exceeds."""
+    failures = []
+    memory_kib = (last.traced_bytes - first.traced_bytes) / 1024
+    if memory_kib > budgets.memory_kib:
+        failures.append(
+            f"memory grew {memory_kib:.1f} KiB, budget {budgets.memory_kib} KiB"
+        )
+    if last.connections - first.connections > budgets.connections:
+        failures.append(
+            f"connections grew from {first.connections} to {last.connections}, "
+            f"budget {budgets.connections}"
+        )
+    if last.tasks - first.tasks > budgets.tasks:
+        failures.append(
+            f"tasks grew from {first.tasks} to {last.tasks}, budget {budgets.tasks}"
+        )
+    first_p50, last_p50 = results[0].percentile(50), results[-1].percentile(50)
+    if first_p50 and last_p50 / first_p50 > budgets.latency_ratio:
+        failures.append(
+            f"median refresh latency grew {last_p50 / first_p50:.2f}x, "
+            f"budget {budgets.latency_ratio}x"
+        )
+    return failures
+
+
+async def soak(  # noqa: PLR0913
+    config: MockPortalConfig,
+    refreshes: int,
+    window: int,
+    reload_every: int,
+    expire_every: int,
+    budgets: SoakBudgets,
+) -> list[BenchmarkResult]:
+    """Run the soak test, failing its last row when a budget is exceeded."""
+    tracemalloc.start()
+    try:
+        async with mock_portal(config) as portal:
+            test = SoakTest(portal, window, reload_every, expire_every)
+            closed = await test.run(refreshes)
+    finally:
+        tracemalloc.stop()
+    test.results[-1].failures = test.check(closed, budgets)
+    return test.results
+
+
+async def run(args: argparse.Namespace) -> list[BenchmarkResult]:
+    """Run the soak test."""
+    return await soak(
+        MockPortalConfig(
+            clients=args.clients,
+            services_per_client=args.services,
+            latency=args.latency,
+            failure_rate=args.failure_rate,
+            # Expiring this long after the refresh margin, so it is renewed
+            hmac_ttl=HMAC_REFRESH_MARGIN + timedelta(seconds=args.hmac_lifetime),
+        ),
+        refreshes=args.refreshes,
+        window=args.window,
+        reload_every=args.reload_every,
+        expire_every=args.expire_every,
+        budgets=SoakBudgets(
+            memory_kib=args.memory_budget,
+            connections=args.connection_budget,
+            tasks=args.task_budget,
+            latency_ratio=args.latency_budget,
+        ),
+    )
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the soak test arguments."""
+    parser.add_argument("--refreshes", type=int, default=5000)
+    parser.add_argument("--window", type=int, default=500, help="refreshes")
+    parser.add_argument(
+        "--reload-every", type=int, default=250, help="refreshes, as an entry reload"
+    )
+    parser.add_argument(
+        "--expire-every",
+        type=int,
+        default=100,
+        help="refreshes between revoking the hmac, 0 never",
+    )
+    parser.add_argument(
+        "--hmac-lifetime",
+        type=float,
+        default=10.0,
+        help="seconds an hmac lasts before it is due for renewal",
+    )
+    parser.add_argument("--clients", type=int, default=1)
+    parser.add_argument("--services", type=int, default=10, help="per client")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--memory-budget", type=float, default=1024.0, help="KiB of growth"
+    )
+    parser.add_argument("--connection-budget", type=int, default=2)
+    parser.add_argument("--task-budget", type=int, default=2)
+    parser.add_argument(
+        "--latency-budget",
+        type=float,
+        default=2.0,
+        help="growth of the median refresh latency, as a ratio",
+    )
@@ -0,0 +1,88 @@
+"""Benchmarks of the import and setup work Home Assistant waits for at startup."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .bench_mfa import IMPORTS, bench_import
+from .harness import (
+    BenchmarkResult,
+    MemoryCredentialStore,
+    measure,
+    mock_portal,
+    portal_client,
+    refresh,
+)
+from .mock_portal import MockPortalConfig
+
+if TYPE_CHECKING:
+    import argparse
+
+    from .mock_portal import MockPortal
+
+
+async def bench_setup(
+    portal: MockPortal, iterations: int, name: str, *, warm: bool, fast: bool
+) -> BenchmarkResult:
+    """Measure the work done before the entities of an entry can be added."""
+    store = MemoryCredentialStore()
+    if warm:
+        async with portal_client(portal, credential_store=store) as client:
+            await refresh(client)
+
+    async def run() -> None:
+        # A restart starts from what the previous run stored, a new entry from nothing
+        async with portal_client(
+            portal, credential_store=store if warm else MemoryCredentialStore()
+        ) as client:
+            if not (fast and await client.async_get_cached_services()):
+                await refresh(client)
+
+    return await measure(BenchmarkResult(name), iterations, run, portal)
+
+
+async def run(args: argparse.Namespace) -> list[BenchmarkResult]:
+    """Run the startup benchmarks."""
+    module, preload = IMPORTS["import integration"]
+    results = [
+        await bench_import(
+            "import integration", module, preload, args.import_iterations
+        )
+    ]
+    async with mock_portal(
+        MockPortalConfig(services_per_client=args.services, latency=args.latency)
+    ) as portal:
+        results.extend(
+            [
+                await bench_setup(
+                    portal,
+                    args.iterations,
+                    "setup, new entry",
+                    warm=False,
+                    fast=False,
+                ),
+                await bench_setup(
+                    portal,
+                    args.iterations,
+                    "setup, restart",
+                    warm=True,
+                    fast=False,
+                ),
+                await bench_setup(
+                    portal,
+                    args.iterations,
+                    "setup, restart with fast startup",
+                    warm=True,
+                    fast=True,
+                ),
+            ]
+        )
+    return results
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the startup benchmark arguments."""
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--import-iterations", type=int, default=5)
+    parser.add_argument("--services", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds")
@@ -0,0 +1,216 @@
+"""Shared helpers for the integration_infinitenetworks benchmarks."""
+
+from __future__ import annotations
+
+import copy
+import statistics
+import time
+import tracemalloc
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+from custom_components.integration_infinitenetworks.api import (
+    InfinteNetworksApiClient,
+)
+from custom_components.integration_infinitenetworks.cache import InfinteResponseCache
+from custom_components.integration_infinitenetworks.instrumentation import (
+    InfinteNetworksInstrumentation,
+)
+from custom_components.integration_infinitenetworks.resilience import RetryPolicy
+from custom_components.integration_infinitenetworks.transport import (
+    InfinteNetworksTransport,
+    create_session,
+)
+
+from .mock_portal import (
+    MFA_SHARED_SECRET,
+    PASSWORD,
+    USERNAME,
+    MockPortal,
+    MockPortalConfig,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+    from custom_components.integration_infinitenetworks.api import (
+        InfinteCredentials,
+        InfinteServiceCache,
+        VisionDetails,
+    )
+
+
+@dataclass
+class BenchmarkResult:
+    """Latencies, request counts and allocations of one benchmark."""
+
+    name: str
+    items_per_iteration: int = 1
+    latencies: list[float] = field(default_factory=list)
+    requests: int = 0
+    peak_bytes: list[int] = field(default_factory=list)
+    retained_bytes: list[int] = field(default_factory=list)
+    # Extra columns, e.g. the sampled state of a soak test
+    gauges: dict[str, Any] = field(default_factory=dict)
+    # Budgets the benchmark went past, failing the run
+    failures: list[str] = field(default_factory=list)
+
+    @property
+    def iterations(self) -> int:
+        """Return the number of measured iterations."""
+        return len(self.latencies)
+
+    def percentile(self, percent: float) -> float:
+        """Return a latency percentile in seconds."""
+        if len(self.latencies) < 2:  # noqa: PLR2004
+            return self.latencies[0] if self.latencies else 0.0
+        return statistics.quantiles(self.latencies, n=100, method="inclusive")[
+            int(percent) - 1
+        ]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the summary of the benchmark."""
+        return {
+            "name": self.name,
+            "iterations": self.iterations,
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "items_per_s": round(
+                self.items_per_iteration * self.iterations / (sum(self.latencies) or 1),
+                1,
+            ),
+            "requests_per_iteration": round(self.requests / max(self.iterations, 1), 2),
+            "peak_kib": round(statistics.fmean(self.peak_bytes or [0]) / 1024, 1),
+            "retained_kib": round(
+                statistics.fmean(self.retained_bytes or [0]) / 1024, 1
+            ),
+            **self.gauges,
+        }
+
+
+def format_results(results: list[BenchmarkResult]) -> str:
+    """Format the results as a table."""
+    rows = [result.as_dict() for result in results]
+    columns = list(rows[0]) if rows else []
+    widths = {
+        column: max(len(column), *(len(str(row[column])) for row in rows))
+        for column in columns
+    }
+    lines = ["  ".join(column.ljust(widths[column]) for column in columns)]
+    lines.extend(
+        "  ".join(str(row[column]).ljust(widths[column]) for column in columns)
+        for row in rows
+    )
+    return "\n".join(lines)
+
+
+async def measure(
+    result: BenchmarkResult,
+    iterations: int,
+    run: Callable[[], Awaitable[Any]],
+    portal: MockPortal | None = None,
+) -> BenchmarkResult:
+    """Time the iterations, then repeat them under tracemalloc for allocations."""
+    requests_before = portal.requests.total() if portal else 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await run()
+        result.latencies.append(time.perf_counter() - start)
+    if portal:
+        result.requests = portal.requests.total() - requests_before
+
+    tracemalloc.start()
+    try:
+        for _ in range(iterations):
+            tracemalloc.reset_peak()
+            before, _peak = tracemalloc.get_traced_memory()
+            await run()
+            current, peak = tracemalloc.get_traced_memory()
+            result.peak_bytes.append(peak - before)
+            result.retained_bytes.append(current - before)
+    finally:
+        tracemalloc.stop()
+    return result
+
+
+class MemoryCredentialStore:
+    """Credential store keeping what a restart would find on disk in memory."""
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self.credentials: InfinteCredentials | None = None
+        self.services: dict[int, InfinteServiceCache] = {}
+
+    async def async_load(self) -> InfinteCredentials | None:
+        """Load the persisted credentials."""
+        return copy.deepcopy(self.credentials)
+
+    async def async_save(self, credentials: InfinteCredentials) -> None:
+        """Persist the credentials."""
+        self.credentials = copy.deepcopy(credentials)
+
+    async def async_load_services(self) -> dict[int, InfinteServiceCache]:
+        """Load the persisted service discovery cache."""
+        return copy.deepcopy(self.services)
+
+    async def async_save_services(
+        self, services: dict[int, InfinteServiceCache]
+    ) -> None:
+        """Persist the service discovery cache."""
+        self.services = copy.deepcopy(services)
+
+
+@asynccontextmanager
+async def mock_portal(config: MockPortalConfig) -> AsyncIterator[MockPortal]:
+    """Run a mock portal for the duration of the context."""
+    portal = MockPortal(config)
+    await portal.start()
+    try:
+        yield portal
+    finally:
+        await portal.stop()
+
+
+@asynccontextmanager
+async def portal_client(
+    portal: MockPortal,
+    transport_factory: Callable[[aiohttp.ClientSession], InfinteNetworksTransport]
+    | None = None,
+    **kwargs: Any,
+) -> AsyncIterator[InfinteNetworksApiClient]:
+    """Return a client with its own session talking to the mock portal."""
+    instrumentation = kwargs.setdefault(
+        "instrumentation", InfinteNetworksInstrumentation()
+    )
+    # The mock portal runs on an IP address, which needs an unsafe cookie jar
+    async with create_session(
+        cookie_jar=aiohttp.CookieJar(unsafe=True),
+        trace_configs=[instrumentation.trace_config()],
+    ) as session:
+        kwargs.setdefault("retry_policy", RetryPolicy(backoff=0.01))
+        # Refreshes are minutes apart, longer than any response stays fresh
+        kwargs.setdefault("response_cache", InfinteResponseCache(ttls={}))
+        if transport_factory:
+            kwargs["transport"] = transport_factory(session)
+        client = InfinteNetworksApiClient(
+            username=USERNAME,
+            password=PASSWORD,
+            mfa_shared_secret=MFA_SHARED_SECRET,
+            session=session,
+            sso_url=portal.sso_url,
+            api_url=portal.api_url,
+            **kwargs,
+        )
+        try:
+            yield client
+        finally:
+            await client.async_close()
+
+
+async def refresh(client: InfinteNetworksApiClient) -> dict[int, VisionDetails]:
+    """Do the API work of one coordinator refresh."""
+    services = await client.async_get_services()
+    return await client.async_get_all_vision_details(services)
@@ -0,0 +1,303 @@
+"""Local stand-in for the Infinite Networks SSO and API hosts."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import random
+import secrets
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+import pyotp
+from aiohttp import web
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    _Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+USERNAME = "user@example.com"
+PASSWORD = "password"  # noqa: S105
+MFA_SHARED_SECRET = "JBSWY3DPEHPK3PXP"  # noqa: S105
+
+SESSION_COOKIE = "SSOSESSID"
+# SSO sessions and access tokens kept, the oldest expire first like on the portal
+MAX_SESSIONS = 16
+
+
+@dataclass
+class MockPortalConfig:
+    """Behaviour of the mock portal."""
+
+    clients: int = 1
+    services_per_client: int = 1
+    latency: float = 0.0
+    failure_rate: float = 0.0
+    hmac_ttl: timedelta = timedelta(hours=1)
+    etag: bool = False
+
+
+@dataclass
+class _SsoSession:
+    token: str
+    authenticated: bool = False
+
+
+@dataclass
+class MockPortal:
+    """Serve the SSO login, MFA, token and API endpoints on localhost."""
+
+    config: MockPortalConfig = field(default_factory=MockPortalConfig)
+    requests: Counter[str] = field(default_factory=Counter)
+
+    def __post_init__(self) -> None:
+        """Initialize the portal state."""
+        self._sessions: dict[str, _SsoSession] = {}
+        self._access_tokens: dict[str, None] = {}
+        self._hmacs: set[str] = set()
+        self._runners: list[web.AppRunner] = []
+        self.clients = {
+            100 + client: [
+                1000 + client * 1000 + service
+                for service in range(self.config.services_per_client)
+            ]
+            for client in range(self.config.clients)
+        }
+        self.details = {
+            service_id: _details(service_id)
+            for services in self.clients.values()
+            for service_id in services
+        }
+        self.sso_url = ""
+        self.api_url = ""
+
+    async def start(self) -> None:
+        """Start the SSO and API hosts on free ports."""
+        self.sso_url = await self._start_app(self._sso_app())
+        self.api_url = await self._start_app(self._api_app())
+
+    async def stop(self) -> None:
+        """Stop both hosts."""
+        for runner in self._runners:
+            await runner.cleanup()
+        self._runners.clear()
+
+    @property
+    def connections(self) -> int:
+        """Return the number of open client connections to both hosts."""
+        return sum(
+            len(runner.server.connections) for runner in self._runners if runner.server
+        )
+
+    def expire_hmacs(self) -> None:
+        """Reject every hmac handed out so far."""
+        self._hmacs.clear()
+
+    def set_details(self, service_id: int, **details: object) -> None:
+        """Change the Vision details served for a service."""
+        self.details[service_id] = {
+            "details": {**self.details[service_id]["details"], **details}
+        }
+
+    async def _start_app(self, app: web.Application) -> str:
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        self._runners.append(runner)
+        host, port = runner.addresses[0][:2]
+        return f"http://{host}:{port}"
+
+    def _sso_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/", self._page)
+        app.router.add_get("/login", self._page)
+        app.router.add_post("/login", self._login)
+        app.router.add_get("/authenticate", self._mfa_form)
+        app.router.add_post("/authenticate", self._mfa)
+        app.router.add_get("/leave/1", self._leave)
+        app.router.add_get("/portal", self._page)
+        app.router.add_get("/api/me", self._me)
+        return app
+
+    def _api_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware, self._failures])
+        app.router.add_get("/api/incontrol/client/{client_id}/services", self._services)
+        app.router.add_get("/api/vision/service/{service_id}/details", self._details)
+        return app
+
+    @web.middleware
+    async def _middleware(
+        self, request: web.Request, handler: _Handler
+    ) -> web.StreamResponse:
+        """Count requests and inject latency."""
+        resource = request.match_info.route.resource
+        self.requests[
+            f"{request.method} {resource.canonical if resource else '?'}"
+        ] += 1
+        if self.config.latency:
+            await asyncio.sleep(self.config.latency)
+        return await handler(request)
+
+    @web.middleware
+    async def _failures(
+        self, request: web.Request, handler: _Handler
+    ) -> web.StreamResponse:
+        """Inject API failures."""
+        if random.random() < self.config.failure_rate:  # noqa: S311
+            return web.Response(status=503, headers={"Retry-After": "0"})
+        return await handler(request)
+
+    def _session(self, request: web.Request) -> _SsoSession | None:
+        return self._sessions.get(request.cookies.get(SESSION_COOKIE, ""))
+
+    async def _page(self, _request: web.Request) -> web.Response:
+        return web.Response(text="<html><body></body></html>", content_type="text/html")
+
+    async def _login(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        if form.get("_username") != USERNAME or form.get("_password") != PASSWORD:
+            return _redirect("/login")
+        session_id = secrets.token_hex(16)
+        _remember(self._sessions, session_id, _SsoSession(token=secrets.token_hex(16)))
+        response = _redirect("/authenticate")
+        response.set_cookie(SESSION_COOKIE, session_id)
+        return response
+
+    async def _mfa_form(self, request: web.Request) -> web.Response:
+        if (session := self._session(request)) is None:
+            return _redirect("/login")
+        return web.Response(text=mfa_page(session.token), content_type="text/html")
+
+    async def _mfa(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        session = self._session(request)
+        if (
+            session
+            and form.get("two_factor_login[_token]") == session.token
+            and pyotp.TOTP(MFA_SHARED_SECRET).verify(
+                str(form.get("two_factor_login[code]"))
+            )
+        ):
+            session.authenticated = True
+            return _redirect("/")
+        return _redirect("/authenticate")
+
+    async def _leave(self, request: web.Request) -> web.Response:
+        session = self._session(request)
+        if session is None or not session.authenticated:
+            return _redirect("/login")
+        access_token = secrets.token_hex(16)
+        _remember(self._access_tokens, access_token, None)
+        return _redirect(f"/portal#access_token={access_token}&token_type=Bearer")
+
+    async def _me(self, request: web.Request) -> web.Response:
+        access_token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if access_token not in self._access_tokens:
+            raise web.HTTPUnauthorized
+        hmac = secrets.token_hex(32)
+        self._hmacs.add(hmac)
+        expires = datetime.now(UTC) + self.config.hmac_ttl
+        return web.json_response(
+            {
+                "hmac": {
+                    "expires": expires.isoformat(),
+                    "user": USERNAME,
+                    "hmac": hmac,
+                },
+                "clients": [{"id": client_id} for client_id in self.clients],
+            }
+        )
+
+    def _verify_hmac(self, request: web.Request) -> None:
+        authorization = request.headers.get("Authorization", "")
+        if authorization.rpartition(":")[2] not in self._hmacs:
+            raise web.HTTPUnauthorized
+
+    async def _services(self, request: web.Request) -> web.Response:
+        self._verify_hmac(request)
+        client_id = int(request.match_info["client_id"])
+        if client_id not in self.clients:
+            raise web.HTTPNotFound
+        return web.json_response(
+            {
+                "services": [
+                    {"identifier": f"INF{service_id}", "id": service_id}
+                    for service_id in self.clients[client_id]
+                ]
+            }
+        )
+
+    async def _details(self, request: web.Request) -> web.Response:
+        self._verify_hmac(request)
+        service_id = int(request.match_info["service_id"])
+        if service_id not in self.details:
+            raise web.HTTPNotFound
+        body = json.dumps(self.details[service_id]).encode()
+        if not self.config.etag:
+            return web.Response(body=body, content_type="application/json")
+        etag = f'"{hashlib.md5(body).hexdigest()}"'  # noqa: S324
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(
+            body=body, content_type="application/json", headers={"ETag": etag}
+        )
+
+
+def _remember(remembered: dict[str, Any], key: str, value: Any) -> None:
+    """Add to a dict, dropping the oldest entries past the maximum sessions."""
+    remembered[key] = value
+    while len(remembered) > MAX_SESSIONS:
+        del remembered[next(iter(remembered))]
+
+
+def _redirect(location: str) -> web.Response:
+    return web.Response(status=302, headers={"Location": location})
+
+
+def mfa_page(token: str, rows: int = 200) -> str:
+    """Return an MFA page shaped like the real one, with some padding."""
+    padding = "".join(
+        f'<div class="row"><p>Paragraph {index} of the layout</p></div>'
+        for index in range(rows)
+    )
+    return (
+        "<!DOCTYPE html><html><head><title>Two factor authentication</title>"
+        f'</head><body>{padding}<form method="post" action="/authenticate">'
+        '<input type="text" id="two_factor_login_code" name="two_factor_login[code]">'
+        '<input type="hidden" id="two_factor_login__token" '
+        f'name="two_factor_login[_token]" value="{token}">'
+        '<button type="submit">Verify</button></form></body></html>'
+    )
+
+
+def _details(service_id: int) -> dict:
+    """Return Vision details shaped like the real payload."""
+    return {
+        "details": {
+            "service_state": "Up",
+            "last_status_change": "2025-06-19T12:44:32.000+00:00",
+            "router_cpe_mac": "60:22:32:9c:4e:20",
+            "ntu_cpe_mac": "Not Found",
+            "ntu_cpe_make": "ZYXE",
+            "ntu_cpe_model": "4100B0",
+            "ntu_cpe_serial": f"S230Y{service_id:08d}",
+            "ntu_cpe_firmware": "ACCL0b8_D0",
+            "actual_line_rate_up": 95351,
+            "attainable_line_rate_up": 98071,
+            "actual_line_rate_down": 764172,
+            "attainable_line_rate_down": 765685,
+            "line_statistics": [
+                {"band": band, "snr_margin": 9.1, "attenuation": 12.4}
+                for band in ("U0", "U1", "U2", "D1", "D2", "D3")
+            ],
+            "events": [
+                {"time": f"2025-06-{day:02d}T00:00:00+00:00", "type": "retrain"}
+                for day in range(1, 29)
+            ],
+        }
+    }
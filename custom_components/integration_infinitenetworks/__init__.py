@@ -7,21 +7,49 @@ https://github.com/ludeeus/integration_infinitenetworks
 
 from __future__ import annotations
 
-from datetime import timedelta
+from datetime import datetime, timedelta
+from functools import partial
 from typing import TYPE_CHECKING
 
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.const import CONF_USERNAME, Platform
+from homeassistant.core import callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.loader import async_get_loaded_integration
 
-from .api import InfinteNetworksApiClient
-from .const import CONF_MFA_SHARED_SECRET, DOMAIN, LOGGER
-from .coordinator import InfinteNetworksDataUpdateCoordinator
+from .analytics import LineQualityAnalytics
+from .client_pool import async_acquire_client, async_release_client
+from .const import (
+    CONF_FAST_STARTUP,
+    CONF_FLEET_MODE,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_STATE_WATCH_INTERVAL,
+    DEFAULT_FAST_STARTUP,
+    DEFAULT_FLEET_MODE,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_STATE_WATCH_INTERVAL,
+    DOMAIN,
+    HISTORY_SAVE_INTERVAL,
+    LOGGER,
+)
+from .coordinator import (
+    InfinteNetworksDataUpdateCoordinator,
+    InfinteNetworksFleetCoordinator,
+)
 from .data import InfinteNetworksData
+from .history import async_load_history, async_remove_history, async_save_history
+from .sensor import ENTITY_DESCRIPTIONS
+from .snapshot import async_load_snapshot, async_remove_snapshot, async_save_snapshot
+from .store import InfinteNetworksCredentialStore
+from .watcher import InfinteNetworksStateWatcher
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
 
+    from .api import InfiniteService
     from .data import InfinteNetworksConfigEntry
 
 PLATFORMS: list[Platform] = [
@@ -35,33 +63,129 @@ async def async_setup_entry(
     entry: InfinteNetworksConfigEntry,
 ) -> bool:
     """Set up this integration using UI."""
-    coordinator = InfinteNetworksDataUpdateCoordinator(
+    coordinator_class = (
+        InfinteNetworksFleetCoordinator
+        if entry.options.get(CONF_FLEET_MODE, DEFAULT_FLEET_MODE)
+        else InfinteNetworksDataUpdateCoordinator
+    )
+    coordinator = coordinator_class(
         hass=hass,
         logger=LOGGER,
         name=DOMAIN,
-        update_interval=timedelta(hours=1),
+        min_interval=timedelta(
+            minutes=entry.options.get(
+                CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL
+            )
+        ),
+        max_interval=timedelta(
+            minutes=entry.options.get(
+                CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL
+            )
+        ),
         always_update=False,
     )
+    history = await async_load_history(hass, entry.entry_id)
     entry.runtime_data = InfinteNetworksData(
-        client=InfinteNetworksApiClient(
-            username=entry.data[CONF_USERNAME],
-            password=entry.data[CONF_PASSWORD],
-            mfa_shared_secret=entry.data[CONF_MFA_SHARED_SECRET],
-            session=async_get_clientsession(hass),
-        ),
+        client=async_acquire_client(hass, entry),
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
+        history=history,
+        analytics=LineQualityAnalytics(history),
     )
 
-    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
+    entry.async_on_unload(
+        partial(async_release_client, hass, entry.data[CONF_USERNAME])
+    )
+    saved_snapshot = await async_load_snapshot(hass, entry.entry_id)
+
+    async def _async_save() -> None:
+        nonlocal saved_snapshot
+        await async_save_history(hass, entry.entry_id, entry.runtime_data.history)
+        # Only a successful update replaces the snapshot
+        if (snapshot := coordinator.snapshot()) and snapshot != saved_snapshot:
+            saved_snapshot = snapshot
+            await async_save_snapshot(hass, entry.entry_id, snapshot)
+
+    entry.async_on_unload(_async_save)
+
+    async def _async_save_interval(_now: datetime) -> None:
+        await _async_save()
+
+    entry.async_on_unload(
+        async_track_time_interval(hass, _async_save_interval, HISTORY_SAVE_INTERVAL)
+    )
+
+    if saved_snapshot:
+        # Show the details of the last run, flagged stale, straight away and
+        # leave the login and first refresh to the background
+        coordinator.async_restore_snapshot(saved_snapshot)
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
+    elif entry.options.get(CONF_FAST_STARTUP, DEFAULT_FAST_STARTUP) and (
+        services := await entry.runtime_data.client.async_get_cached_services()
+    ):
+        # Register the entities with their restored state straight away, and
+        # leave the login of the first refresh to the background
+        coordinator.services = services
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
+    else:
+        # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
+        await coordinator.async_config_entry_first_refresh()
+
+    if coordinator.services:
+        await _async_migrate_single_service_entities(
+            hass, entry, coordinator.services[0]
+        )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
+    if watch_interval := entry.options.get(
+        CONF_STATE_WATCH_INTERVAL, DEFAULT_STATE_WATCH_INTERVAL
+    ):
+        entry.async_on_unload(
+            InfinteNetworksStateWatcher(
+                hass, entry, timedelta(seconds=watch_interval)
+            ).async_start()
+        )
+
     return True
 
 
+async def _async_migrate_single_service_entities(
+    hass: HomeAssistant,
+    entry: InfinteNetworksConfigEntry,
+    infinite_service: InfiniteService,
+) -> None:
+    """Move the entities created before multi-service support to the first service."""
+    service_unique_id = f"{entry.entry_id}_{infinite_service.id}"
+
+    device_registry = dr.async_get(hass)
+    if device := device_registry.async_get_device(
+        identifiers={(DOMAIN, entry.entry_id)}
+    ):
+        device_registry.async_update_device(
+            device.id,
+            new_identifiers={(DOMAIN, service_unique_id)},
+        )
+
+    legacy_unique_ids = {
+        f"{entry.entry_id}_{entity_description.key}": entity_description.key
+        for entity_description in ENTITY_DESCRIPTIONS
+    }
+
+    @callback
+    def _migrate_unique_id(entity_entry: er.RegistryEntry) -> dict[str, str] | None:
+        if (key := legacy_unique_ids.get(entity_entry.unique_id)) is None:
+            return None
+        return {"new_unique_id": f"{service_unique_id}_{key}"}
+
+    await er.async_migrate_entries(hass, entry.entry_id, _migrate_unique_id)
+
+
 async def async_unload_entry(
     hass: HomeAssistant,
     entry: InfinteNetworksConfigEntry,
@@ -70,10 +194,19 @@ async def async_unload_entry(
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: InfinteNetworksConfigEntry,
+) -> None:
+    """Remove the stored files and credentials."""
+    await async_remove_history(hass, entry.entry_id)
+    await async_remove_snapshot(hass, entry.entry_id)
+    await InfinteNetworksCredentialStore(hass, entry.data[CONF_USERNAME]).async_remove()
+
+
 async def async_reload_entry(
     hass: HomeAssistant,
     entry: InfinteNetworksConfigEntry,
 ) -> None:
     """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    await hass.config_entries.async_reload(entry.entry_id)
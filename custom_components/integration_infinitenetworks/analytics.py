@@ -0,0 +1,139 @@
+"""Line quality analytics over the line rate history of integration_infinitenetworks."""
+
+from __future__ import annotations
+
+import operator
+from array import array
+from bisect import bisect_left
+from itertools import repeat
+from typing import TYPE_CHECKING, NamedTuple
+
+from custom_components.integration_infinitenetworks.const import (
+    ANALYTICS_WINDOW,
+    HISTORY_CAPACITY,
+)
+
+if TYPE_CHECKING:
+    from custom_components.integration_infinitenetworks.api import VisionDetails
+    from custom_components.integration_infinitenetworks.history import (
+        LineRateHistory,
+    )
+
+ANALYTICS_DIRECTIONS = ("down", "up")
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class DirectionQuality(NamedTuple):
+    """Sync efficiency, percentiles and trend of one direction of a line."""
+
+    efficiency: float | None
+    mean_efficiency: float | None
+    p5: float
+    p50: float
+    p95: float
+    # Least-squares slope of the actual line rate, in kbit/s per day
+    slope: float | None
+
+
+class LineQuality(NamedTuple):
+    """Line quality of a service over the analytics window."""
+
+    down: DirectionQuality | None
+    up: DirectionQuality | None
+    retrains: int
+
+
+class LineQualityAnalytics:
+    """Derive the line quality of every service from the line rate history."""
+
+    def __init__(
+        self,
+        history: LineRateHistory,
+        window: int = int(ANALYTICS_WINDOW.total_seconds()),
+    ) -> None:
+        """Initialize the analytics of a history, over a window in seconds."""
+        self.history = history
+        self.window = window
+        self._qualities: dict[int, LineQuality] = {}
+
+    def record(self, data: dict[int, VisionDetails]) -> None:
+        """Record the status changes of an update, after the history recorded it."""
+        for service_id, details in data.items():
+            if details.last_status_change is None:
+                continue
+            changed = int(details.last_status_change.timestamp())
+            changes = self.history.status_changes.setdefault(service_id, array("I"))
+            if changes and changes[-1] >= changed:
+                continue
+            changes.append(changed)
+            if len(changes) > HISTORY_CAPACITY:
+                del changes[0]
+        self._qualities.clear()
+
+    def quality(self, service_id: int, now: int) -> LineQuality:
+        """Return the line quality of a service, cached until the next record."""
+        if (quality := self._qualities.get(service_id)) is None:
+            since = now - self.window
+            changes = self.history.status_changes.get(service_id, array("I"))
+            quality = self._qualities[service_id] = LineQuality(
+                *(
+                    self._direction_quality(service_id, direction, since)
+                    for direction in ANALYTICS_DIRECTIONS
+                ),
+                retrains=len(changes) - bisect_left(changes, since),
+            )
+        return quality
+
+    def _direction_quality(
+        self, service_id: int, direction: str, since: int
+    ) -> DirectionQuality | None:
+        """Compute the quality of one direction from its window of samples."""
+        actual = self.history.buffers.get((service_id, f"actual_line_rate_{direction}"))
+        if actual is None:
+            return None
+        timestamps, values = actual.ordered()
+        start = bisect_left(timestamps, since)
+        timestamps, values = timestamps[start:], values[start:]
+        if not values:
+            return None
+
+        efficiency = mean_efficiency = None
+        attainable = self.history.buffers.get(
+            (service_id, f"attainable_line_rate_{direction}")
+        )
+        if attainable is not None and (attainable_values := attainable.since(since)):
+            if attainable_values[-1]:
+                efficiency = values[-1] / attainable_values[-1]
+            if total := sum(attainable_values):
+                mean_efficiency = sum(values) / total
+
+        ordered = sorted(values)
+        return DirectionQuality(
+            efficiency=efficiency,
+            mean_efficiency=mean_efficiency,
+            p5=percentile(ordered, 0.05),
+            p50=percentile(ordered, 0.5),
+            p95=percentile(ordered, 0.95),
+            slope=least_squares_slope(timestamps, values),
+        )
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of sorted values."""
+    return ordered[round(fraction * (len(ordered) - 1))]
+
+
+def least_squares_slope(timestamps: array, values: array) -> float | None:
+    """Return the least-squares slope of the values per day, None if undefined."""
+    count = len(values)
+    if count < 2:  # noqa: PLR2004
+        return None
+    # Relative to the first sample, the epoch squared loses a double's precision
+    offsets = array("d", map(operator.sub, timestamps, repeat(timestamps[0])))
+    sum_x = sum(offsets)
+    sum_y = sum(values)
+    denominator = count * sum(map(operator.mul, offsets, offsets)) - sum_x * sum_x
+    if not denominator:
+        return None
+    numerator = count * sum(map(operator.mul, offsets, values)) - sum_x * sum_y
+    return numerator / denominator * SECONDS_PER_DAY
@@ -2,18 +2,59 @@
 
 from __future__ import annotations
 
+import asyncio
 import socket
-from datetime import datetime
-from typing import Any, TypedDict
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from http.cookies import SimpleCookie
+from typing import TYPE_CHECKING, Any, NamedTuple, Protocol, TypedDict
 from urllib.parse import parse_qs
 
 import aiohttp
-import async_timeout
-import pyotp
-from attr import dataclass
-from selectolax.parser import HTMLParser
-
-from custom_components.integration_infinitenetworks.const import LOGGER
+from yarl import URL
+
+from custom_components.integration_infinitenetworks.cache import (
+    InfinteCachedResponse,
+    InfinteResponseCache,
+)
+from custom_components.integration_infinitenetworks.const import (
+    API_URL,
+    API_WARMUP_TIMEOUT,
+    DEFAULT_MAX_CONCURRENCY,
+    HMAC_REFRESH_MARGIN,
+    HMAC_REFRESH_RETRY,
+    LOGGER,
+    SERVICE_CACHE_TTL,
+    SSO_URL,
+)
+from custom_components.integration_infinitenetworks.instrumentation import (
+    InfinteNetworksInstrumentation,
+)
+from custom_components.integration_infinitenetworks.mfa import (
+    TOTP_MIN_VALIDITY,
+    async_read_mfa_token,
+    generate_mfa_code,
+    totp_validity,
+)
+from custom_components.integration_infinitenetworks.resilience import (
+    CircuitBreaker,
+    RetryPolicy,
+    RetryStatistics,
+    TokenBucket,
+    parse_retry_after,
+)
+from custom_components.integration_infinitenetworks.transport import (
+    InfinteNetworksTransport,
+)
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
 
 
 class InfinteHmac(TypedDict):
@@ -25,12 +66,174 @@ class InfinteHmac(TypedDict):
     expires_date: datetime
 
 
+class InfinteCookie(TypedDict):
+    """Represents a persisted SSO cookie."""
+
+    name: str
+    value: str
+    domain: str
+    path: str
+
+
+class InfinteCredentials(TypedDict):
+    """Represents the credentials persisted between restarts."""
+
+    hmac: InfinteHmac
+    client_ids: list[int]
+    cookies: list[InfinteCookie]
+
+
 @dataclass
 class InfiniteService:
     """Represents an Infinite Networks Service."""
 
     identifier: str
     id: int
+    client_id: int
+
+
+class InfinteServiceCache(TypedDict):
+    """Represents the services discovered for a client."""
+
+    fetched: datetime
+    services: list[InfiniteService]
+
+
+class VisionDetails:
+    """The fields of the Vision details of a service that the sensors use."""
+
+    __slots__ = (
+        "actual_line_rate_down",
+        "actual_line_rate_up",
+        "attainable_line_rate_down",
+        "attainable_line_rate_up",
+        "last_status_change",
+        "ntu_cpe_firmware",
+        "ntu_cpe_mac",
+        "ntu_cpe_make",
+        "ntu_cpe_model",
+        "ntu_cpe_serial",
+        "router_cpe_mac",
+        "service_state",
+    )
+
+    actual_line_rate_down: int | float | None
+    actual_line_rate_up: int | float | None
+    attainable_line_rate_down: int | float | None
+    attainable_line_rate_up: int | float | None
+    last_status_change: datetime | None
+    ntu_cpe_firmware: str | None
+    ntu_cpe_mac: str | None
+    ntu_cpe_make: str | None
+    ntu_cpe_model: str | None
+    ntu_cpe_serial: str | None
+    router_cpe_mac: str | None
+    service_state: str | None
+
+    def __init__(self, details: Mapping[str, Any]) -> None:
+        """Copy the used fields out of the details, converted to their types."""
+        self.actual_line_rate_down = _as_number(details.get("actual_line_rate_down"))
+        self.actual_line_rate_up = _as_number(details.get("actual_line_rate_up"))
+        self.attainable_line_rate_down = _as_number(
+            details.get("attainable_line_rate_down")
+        )
+        self.attainable_line_rate_up = _as_number(
+            details.get("attainable_line_rate_up")
+        )
+        self.last_status_change = _as_datetime(details.get("last_status_change"))
+        self.ntu_cpe_firmware = _as_str(details.get("ntu_cpe_firmware"))
+        self.ntu_cpe_mac = _as_str(details.get("ntu_cpe_mac"))
+        self.ntu_cpe_make = _as_str(details.get("ntu_cpe_make"))
+        self.ntu_cpe_model = _as_str(details.get("ntu_cpe_model"))
+        self.ntu_cpe_serial = _as_str(details.get("ntu_cpe_serial"))
+        self.router_cpe_mac = _as_str(details.get("router_cpe_mac"))
+        self.service_state = _as_str(details.get("service_state"))
+
+    @classmethod
+    def from_json(cls, body: bytes) -> VisionDetails:
+        """Decode a details response, keeping none of the unused fields."""
+        return cls(json_loads(body).get("details") or {})
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the fields as a dict."""
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __eq__(self, other: object) -> bool:
+        """Return True if every field is equal."""
+        if not isinstance(other, VisionDetails):
+            return NotImplemented
+        return all(
+            getattr(self, field) == getattr(other, field) for field in self.__slots__
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Return the fields."""
+        return f"VisionDetails({self.as_dict()!r})"
+
+
+class InfiniteServiceState(NamedTuple):
+    """The state fields of the Vision details of a service."""
+
+    service_state: str | None
+    last_status_change: datetime | None
+
+    @classmethod
+    def from_json(cls, body: bytes) -> InfiniteServiceState:
+        """Decode a details response, keeping only the state fields."""
+        details = json_loads(body).get("details") or {}
+        return cls(
+            _as_str(details.get("service_state")),
+            _as_datetime(details.get("last_status_change")),
+        )
+
+
+def _as_number(value: Any) -> int | float | None:
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
+
+
+def _as_datetime(value: Any) -> datetime | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    # Timestamp sensors need an aware datetime, the API reports UTC
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def _as_str(value: Any) -> str | None:
+    return None if value is None else str(value)
+
+
+class InfinteNetworksCredentialStore(Protocol):
+    """Storage used to persist credentials between restarts."""
+
+    async def async_load(self) -> InfinteCredentials | None:
+        """Load the persisted credentials."""
+
+    async def async_save(self, credentials: InfinteCredentials) -> None:
+        """Persist the credentials."""
+
+    async def async_load_services(self) -> dict[int, InfinteServiceCache]:
+        """Load the persisted service discovery cache."""
+
+    async def async_save_services(
+        self, services: dict[int, InfinteServiceCache]
+    ) -> None:
+        """Persist the service discovery cache."""
 
 
 class InfinteNetworksApiClientError(Exception):
@@ -49,6 +252,29 @@ class InfinteNetworksApiClientAuthenticationError(
     """Exception to indicate an authentication error."""
 
 
+class InfinteNetworksApiClientNotFoundError(
+    InfinteNetworksApiClientCommunicationError,
+):
+    """Exception to indicate the requested resource does not exist."""
+
+
+class InfinteNetworksApiClientRateLimitError(
+    InfinteNetworksApiClientCommunicationError,
+):
+    """Exception to indicate the API asked us to slow down."""
+
+    def __init__(self, msg: str, retry_after: float | None) -> None:
+        """Initialize the exception with the delay requested by the API."""
+        super().__init__(msg)
+        self.retry_after = retry_after
+
+
+class InfinteNetworksApiClientCircuitOpenError(
+    InfinteNetworksApiClientCommunicationError,
+):
+    """Exception to indicate requests are paused after repeated failures."""
+
+
 class InfinteNetworksApiClientMfaError(
     InfinteNetworksApiClientError,
 ):
@@ -62,6 +288,17 @@ def _verify_response_or_raise(response: aiohttp.ClientResponse) -> None:
         raise InfinteNetworksApiClientAuthenticationError(
             msg,
         )
+    if response.status == 404:  # noqa: PLR2004
+        msg = f"Resource not found {response.url}"
+        raise InfinteNetworksApiClientNotFoundError(
+            msg,
+        )
+    if response.status in (429, 503):
+        msg = f"API is unavailable or rate limited ({response.status})"
+        raise InfinteNetworksApiClientRateLimitError(
+            msg,
+            retry_after=parse_retry_after(response.headers.get("Retry-After")),
+        )
     response.raise_for_status()
 
 
@@ -99,23 +336,86 @@ def _extract_hmac(json: dict) -> InfinteHmac:
     )
 
 
+def _conditional_headers(cached: InfinteCachedResponse, headers: dict | None) -> dict:
+    """Add the validators of a cached response to the request headers."""
+    headers = dict(headers or {})
+    if cached.etag:
+        headers[aiohttp.hdrs.IF_NONE_MATCH] = cached.etag
+    if cached.last_modified:
+        headers[aiohttp.hdrs.IF_MODIFIED_SINCE] = cached.last_modified
+    return headers
+
+
+def _is_retryable(exception: InfinteNetworksApiClientError) -> bool:
+    """Return True if the request may succeed when it is sent again."""
+    if not isinstance(exception, InfinteNetworksApiClientCommunicationError) or (
+        isinstance(
+            exception,
+            InfinteNetworksApiClientNotFoundError
+            | InfinteNetworksApiClientCircuitOpenError,
+        )
+    ):
+        return False
+    cause = exception.__cause__
+    # Other client errors such as a 400 will fail the same way again
+    return not (isinstance(cause, aiohttp.ClientResponseError) and cause.status < 500)  # noqa: PLR2004
+
+
+def _hmac_is_valid(hmac: InfinteHmac | None) -> bool:
+    """Return True if the hmac exists and has not expired yet."""
+    return bool(
+        hmac and hmac["expires_date"] > datetime.now(hmac["expires_date"].tzinfo)
+    )
+
+
 class InfinteNetworksApiClient:
     """Sample API Client."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         username: str,
         password: str,
         mfa_shared_secret: str,
         session: aiohttp.ClientSession,
+        credential_store: InfinteNetworksCredentialStore | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        retry_policy: RetryPolicy | None = None,
+        sso_url: str = SSO_URL,
+        api_url: str = API_URL,
+        instrumentation: InfinteNetworksInstrumentation | None = None,
+        rate_limiter: TokenBucket | None = None,
+        transport: InfinteNetworksTransport | None = None,
+        response_cache: InfinteResponseCache | None = None,
     ) -> None:
         """Sample API Client."""
         self._username = username
         self._password = password
         self._mfa_shared_secret = mfa_shared_secret
         self._session = session
+        self._transport = transport or InfinteNetworksTransport(session)
+        self._sso_url = sso_url
+        self._api_url = api_url
+        self._credential_store = credential_store
+        self._credentials_loaded = False
+        self._sso_cookies_restored = False
         self._hmac: InfinteHmac | None = None
-        self._client_id: int | None = None
+        self._client_ids: list[int] | None = None
+        self._services: dict[int, InfinteServiceCache] | None = None
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._refresh_loop: asyncio.Task[None] | None = None
+        self._refresh_now = asyncio.Event()
+        self._warmup_task: asyncio.Task[None] | None = None
+        # The last hmac a rejected request logged in again for
+        self._relogin_hmac: InfinteHmac | None = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._retry_policy = retry_policy or RetryPolicy()
+        self.retry_statistics = RetryStatistics()
+        self.circuit_breaker = CircuitBreaker()
+        # Shared by every consumer of the account, so nothing is fetched twice
+        # while it is fresh
+        self.response_cache = response_cache or InfinteResponseCache()
+        self.instrumentation = instrumentation or InfinteNetworksInstrumentation()
+        self._rate_limiter = rate_limiter
 
     @property
     def hmac(self) -> InfinteHmac:
@@ -128,84 +428,363 @@ class InfinteNetworksApiClient:
         )
 
     @property
-    def client_id(self) -> int:
-        """Return the client ID."""
-        if self._client_id:
-            return self._client_id
+    def client_ids(self) -> list[int]:
+        """Return the IDs of every client the account can access."""
+        if self._client_ids:
+            return self._client_ids
         msg = "client id missing"
         raise InfinteNetworksApiClientAuthenticationError(
             msg,
         )
 
-    async def async_get_service(self) -> InfiniteService:
-        """Get the first service from the API."""
-        if not self._client_id:
+    async def _ensure_logged_in(self) -> None:
+        """Log in unless the client IDs are already known."""
+        if self._client_ids:
+            return
+        try:
             await self._refresh_hmac_and_client()
-
-        async with async_timeout.timeout(10):
-            json = await self._api_wrapper(
-                method="get",
-                url=f"https://invocation.infinite.net.au/api/incontrol/client/{self.client_id}/services",
-            )
-
-            return InfiniteService(
-                identifier=json["services"][0]["identifier"],
-                id=json["services"][0]["id"],
+        except Exception as exception:
+            self.instrumentation.error(exception)
+            raise
+
+    async def async_get_services(self) -> list[InfiniteService]:
+        """Get the services of every client, from the discovery cache when fresh."""
+        await self._ensure_logged_in()
+
+        await self._load_services()
+        client_services = await asyncio.gather(
+            *(
+                self._async_get_client_services(client_id)
+                for client_id in self.client_ids
             )
+        )
+        return [service for services in client_services for service in services]
+
+    async def async_get_cached_services(self) -> list[InfiniteService]:
+        """Get the last discovered services, however old, without any request."""
+        services = await self._load_services()
+        return [
+            service for cached in services.values() for service in cached["services"]
+        ]
+
+    async def _async_get_client_services(self, client_id: int) -> list[InfiniteService]:
+        """Get the services of a single client."""
+        services = await self._load_services()
+        cached = services.get(client_id)
+        if cached and cached["fetched"] + SERVICE_CACHE_TTL > datetime.now(UTC):
+            self.instrumentation.count("cache_hits")
+            return cached["services"]
+
+        async with self._semaphore:
+            with self.instrumentation.span("services"):
+                json = await self._api_wrapper(
+                    method="get",
+                    url=self._services_url(client_id),
+                    request_timeout=10,
+                )
 
-    async def async_get_vision_details(self, infinite_service: InfiniteService) -> Any:
+        services[client_id] = InfinteServiceCache(
+            fetched=datetime.now(UTC),
+            services=[
+                InfiniteService(
+                    identifier=service["identifier"],
+                    id=service["id"],
+                    client_id=client_id,
+                )
+                for service in json["services"]
+            ],
+        )
+        await self._save_services()
+        return services[client_id]["services"]
+
+    def _services_url(self, client_id: int) -> str:
+        return f"{self._api_url}/api/incontrol/client/{client_id}/services"
+
+    async def async_get_all_vision_details(
+        self, infinite_services: list[InfiniteService]
+    ) -> dict[int, VisionDetails]:
+        """Get Vision details of several services concurrently, keyed by service ID."""
+        details = await asyncio.gather(
+            *(self.async_get_vision_details(service) for service in infinite_services)
+        )
+        return {
+            service.id: service_details
+            for service, service_details in zip(infinite_services, details, strict=True)
+        }
+
+    async def async_get_vision_details(
+        self, infinite_service: InfiniteService
+    ) -> VisionDetails:
         """Get Vision details from the API, including things like sync speed, etc."""
-        if not self._client_id:
-            await self._refresh_hmac_and_client()
+        return await self._async_get_details(
+            infinite_service, "details", VisionDetails.from_json
+        )
+
+    async def async_get_service_state(
+        self, infinite_service: InfiniteService
+    ) -> InfiniteServiceState:
+        """Get just the state of a service, for frequent polling."""
+        # There is no cheaper status view, so project the details down to the state
+        return await self._async_get_details(
+            infinite_service, "service_state", InfiniteServiceState.from_json
+        )
+
+    async def _async_get_details(
+        self,
+        infinite_service: InfiniteService,
+        span: str,
+        decoder: Callable[[bytes], Any],
+    ) -> Any:
+        """Get the Vision details of a service, decoded by the decoder."""
+        await self._ensure_logged_in()
 
-        async with async_timeout.timeout(30):
-            detail_url = f"https://invocation.infinite.net.au/api/vision/service/{infinite_service.id}/details"
-            LOGGER.debug("Fetching Vision connection details from %s", detail_url)
-            return await self._api_wrapper(
-                method="get",
-                url=detail_url,
+        detail_url = f"{self._api_url}/api/vision/service/{infinite_service.id}/details"
+        try:
+            async with self._semaphore:
+                LOGGER.debug("Fetching Vision connection details from %s", detail_url)
+                with self.instrumentation.span(span):
+                    return await self._api_wrapper(
+                        method="get",
+                        url=detail_url,
+                        request_timeout=30,
+                        decoder=decoder,
+                    )
+        except (
+            InfinteNetworksApiClientAuthenticationError,
+            InfinteNetworksApiClientNotFoundError,
+        ):
+            # The service may have moved or been removed, so discover it again
+            self.response_cache.invalidate(detail_url)
+            await self._invalidate_services(infinite_service.client_id)
+            raise
+
+    async def _load_services(self) -> dict[int, InfinteServiceCache]:
+        """Return the service discovery cache, loading it from storage once."""
+        if self._services is None:
+            self._services = (
+                await self._credential_store.async_load_services()
+                if self._credential_store
+                else {}
+            )
+        return self._services
+
+    async def _save_services(self) -> None:
+        """Persist the service discovery cache."""
+        if self._credential_store and self._services is not None:
+            await self._credential_store.async_save_services(self._services)
+
+    async def _invalidate_services(self, client_id: int) -> None:
+        """Drop the discovered services of a client."""
+        self.response_cache.invalidate(self._services_url(client_id))
+        if self._services and self._services.pop(client_id, None):
+            LOGGER.debug("Invalidated the services of client %s", client_id)
+            await self._save_services()
+
+    def close(self) -> None:
+        """Cancel the background and in-flight hmac refreshes."""
+        for task in (self._refresh_loop, self._refresh_task, self._warmup_task):
+            if task and not task.done():
+                task.cancel()
+        self._refresh_loop = None
+
+    async def async_close(self) -> None:
+        """Cancel the hmac refreshes and wait for them to finish."""
+        tasks = [
+            task
+            for task in (self._refresh_loop, self._refresh_task, self._warmup_task)
+            if task
+        ]
+        self.close()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _refresh_hmac_and_client(self, *, force_login: bool = False) -> None:
+        """Refresh the hmac, sharing one in-flight login between all callers."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(
+                self._async_refresh_hmac_and_client(force_login=force_login)
             )
+        # Shield the shared login so a cancelled caller does not abort it for others
+        await asyncio.shield(self._refresh_task)
+
+    async def _async_refresh_hmac_and_client(self, *, force_login: bool) -> None:
+        if force_login or not await self._restore_credentials():
+            hmac, client_ids = await self._fetch_hmac_and_client()
+            # Publish the new credentials together so requests never mix them
+            self._hmac, self._client_ids = hmac, client_ids
+            await self._save_credentials()
+        if self._refresh_loop is None or self._refresh_loop.done():
+            self._refresh_loop = asyncio.create_task(self._async_refresh_loop())
+
+    def _request_refresh(self) -> None:
+        """Renew the hmac in the background now, e.g. after it was rejected."""
+        self._refresh_now.set()
+        if self._hmac and (self._refresh_loop is None or self._refresh_loop.done()):
+            self._refresh_loop = asyncio.create_task(self._async_refresh_loop())
+
+    async def _async_refresh_loop(self) -> None:
+        """Renew the hmac before it expires, so requests never wait for a login."""
+        while self._hmac:
+            try:
+                async with asyncio.timeout(self._seconds_until_refresh(self._hmac)):
+                    await self._refresh_now.wait()
+            except TimeoutError:
+                pass
+            self._refresh_now.clear()
+
+            LOGGER.debug("Refreshing the hmac for %s in the background", self._username)
+            try:
+                await self._refresh_hmac_and_client(force_login=True)
+            except (
+                InfinteNetworksApiClientAuthenticationError,
+                InfinteNetworksApiClientMfaError,
+            ) as exception:
+                # Retrying rejected credentials risks locking the account, stop
+                # until a request is rejected again
+                self.instrumentation.error(exception)
+                LOGGER.warning("Background hmac refresh was rejected: %s", exception)
+                return
+            except (
+                InfinteNetworksApiClientError,
+                aiohttp.ClientError,
+                TimeoutError,
+            ) as exception:
+                # Requests keep the current hmac while it lasts, try again shortly
+                self.instrumentation.error(exception)
+                LOGGER.warning("Background hmac refresh failed: %s", exception)
+                await asyncio.sleep(HMAC_REFRESH_RETRY.total_seconds())
+
+    @staticmethod
+    def _seconds_until_refresh(hmac: InfinteHmac) -> float:
+        """Return the delay until the refresh before expiry, in a usable TOTP step."""
+        expires_date = hmac["expires_date"]
+        delay = max(
+            expires_date - datetime.now(expires_date.tzinfo) - HMAC_REFRESH_MARGIN,
+            timedelta(),
+        ).total_seconds()
+        # Start at the next step rather than with a code about to expire
+        if (validity := totp_validity(time.time() + delay)) < TOTP_MIN_VALIDITY:
+            delay += validity
+        return delay
+
+    async def _restore_credentials(self) -> bool:
+        """Restore persisted credentials, returns True if they are still valid."""
+        if self._credentials_loaded or not self._credential_store:
+            return False
+        self._credentials_loaded = True
+
+        credentials = await self._credential_store.async_load()
+        if not credentials:
+            return False
+
+        cookies: SimpleCookie = SimpleCookie()
+        for cookie in credentials["cookies"]:
+            cookies[cookie["name"]] = cookie["value"]
+            cookies[cookie["name"]]["domain"] = cookie["domain"]
+            cookies[cookie["name"]]["path"] = cookie["path"]
+        self._session.cookie_jar.update_cookies(cookies, URL(self._sso_url))
+        self._sso_cookies_restored = bool(cookies)
+
+        if not _hmac_is_valid(credentials["hmac"]):
+            LOGGER.debug("Persisted hmac for %s has expired", self._username)
+            return False
+
+        LOGGER.debug("Reusing persisted hmac for %s", self._username)
+        self._hmac = credentials["hmac"]
+        self._client_ids = credentials["client_ids"]
+        return True
+
+    async def _save_credentials(self) -> None:
+        """Persist the current credentials so they survive a restart."""
+        if not self._credential_store or not self._hmac or not self._client_ids:
+            return
+
+        cookies: list[InfinteCookie] = [
+            InfinteCookie(
+                name=morsel.key,
+                value=morsel.value,
+                domain=morsel["domain"],
+                path=morsel["path"],
+            )
+            # The account has its own cookie jar, so every cookie belongs to it
+            for morsel in self._session.cookie_jar
+        ]
+        await self._credential_store.async_save(
+            InfinteCredentials(
+                hmac=self._hmac,
+                client_ids=self._client_ids,
+                cookies=cookies,
+            )
+        )
 
-    async def _refresh_hmac_and_client(self) -> None:
-        self._hmac, self._client_id = await self._fetch_hmac_and_client()
+    async def _fetch_hmac_and_client(self) -> tuple[InfinteHmac, list[int]]:
+        """Log in, connecting to the API host meanwhile on the first login."""
+        if self._hmac is None and self._warmup_task is None:
+            # The first API requests wait for this login, so open their
+            # connection while the SSO steps run, without holding up the login
+            self._warmup_task = asyncio.create_task(self._warm_api_connection())
+        with self.instrumentation.span("login"):
+            return await self._login()
+
+    async def _warm_api_connection(self) -> None:
+        """Open a keep-alive connection to the API host, ignoring any failure."""
+        try:
+            async with asyncio.timeout(API_WARMUP_TIMEOUT):
+                with self.instrumentation.span("api_warmup"):
+                    await self._transport.request("head", self._api_url)
+        except (aiohttp.ClientError, TimeoutError) as exception:
+            LOGGER.debug(
+                "Connecting to the API ahead of the login failed: %s", exception
+            )
 
-    async def _fetch_hmac_and_client(self) -> tuple[InfinteHmac, int]:
-        async with async_timeout.timeout(10):
+    async def _login(self) -> tuple[InfinteHmac, list[int]]:
+        if self._sso_cookies_restored:
+            # The persisted SSO session may still be alive, which skips the MFA
+            self._sso_cookies_restored = False
+            try:
+                return await self._fetch_hmac_from_sso_session()
+            except InfinteNetworksApiClientAuthenticationError:
+                LOGGER.debug("Persisted SSO session expired, logging in again")
+
+        await self._sso_login()
+        return await self._fetch_hmac_from_sso_session()
+
+    async def _sso_login(self) -> None:
+        self.instrumentation.count("logins")
+        # Including the wait for the next TOTP step
+        async with asyncio.timeout(10 + TOTP_MIN_VALIDITY):
             data = aiohttp.FormData()
             data.add_field("_username", self._username)
             data.add_field("_password", self._password)
-            response = await self._session.post(
-                url="https://sso.infinite.net.au/login",
-                data=data,
-            )
-
-            _verify_sso_auth_response_or_raise(response)
+            token = None
+            with self.instrumentation.span("sso_login"):
+                async with self._transport.stream(
+                    "post", f"{self._sso_url}/login", data=data
+                ) as response:
+                    _verify_sso_auth_response_or_raise(response)
+                    if response.url.path == "/authenticate":
+                        # Grab the two factor token while the MFA form streams in
+                        token = await async_read_mfa_token(response)
+                    else:
+                        await response.read()
 
             if response.url.path == "/authenticate":
                 # Time to do MFA
-                mfa = pyotp.TOTP(self._mfa_shared_secret)
-                mfa_code = mfa.now()
-
-                # Grab the two factor token from the response
-                html_text = await response.text()
-                tree = HTMLParser(html=html_text)
-                token_elem = tree.css_first("input#two_factor_login__token")
-                if token_elem:
-                    token = token_elem.attributes["value"]
-                else:
+                if token is None:
                     msg = "Unable to find two factor token in MFA form"
                     raise InfinteNetworksApiClientMfaError(
                         msg,
                     )
 
+                mfa_code = await self._async_mfa_code()
+
                 data = aiohttp.FormData()
                 data.add_field("two_factor_login[code]", mfa_code)
                 data.add_field("two_factor_login[_token]", token)
 
-                response = await self._session.post(
-                    url="https://sso.infinite.net.au/authenticate",
-                    data=data,
-                )
+                with self.instrumentation.span("mfa"):
+                    response, _body = await self._transport.request(
+                        "post", f"{self._sso_url}/authenticate", data=data
+                    )
 
                 if response.url.path != "/":
                     # We are not authenticated
@@ -218,52 +797,193 @@ class InfinteNetworksApiClient:
 
                 # MFA is done, we should be authenticated now
 
-            response = await self._session.get(
-                url="https://sso.infinite.net.au/leave/1"
-            )
-
-            access_token = _extract_access_token(response)
+    async def _async_mfa_code(self) -> str:
+        """Return a TOTP code that is still valid when the MFA form arrives."""
+        now = time.time()
+        if (validity := totp_validity(now)) >= TOTP_MIN_VALIDITY:
+            return generate_mfa_code(self._mfa_shared_secret, now)
+
+        # The code could expire in transit, so generate the next step's code
+        # now and post it once that step has started
+        mfa_code = generate_mfa_code(self._mfa_shared_secret, now + validity)
+        self.instrumentation.count("totp_waits")
+        with self.instrumentation.span("totp_wait"):
+            await asyncio.sleep(validity)
+        return mfa_code
+
+    async def _fetch_hmac_from_sso_session(self) -> tuple[InfinteHmac, list[int]]:
+        async with asyncio.timeout(10):
+            with self.instrumentation.span("token_extraction"):
+                response, _body = await self._transport.request(
+                    "get", f"{self._sso_url}/leave/1"
+                )
+                access_token = _extract_access_token(response)
 
-            response = await self._session.get(
-                url="https://sso.infinite.net.au/api/me",
-                headers={"Authorization": f"Bearer {access_token}"},
-            )
+            with self.instrumentation.span("hmac_fetch"):
+                _response, body = await self._transport.request(
+                    "get",
+                    f"{self._sso_url}/api/me",
+                    headers={"Authorization": f"Bearer {access_token}"},
+                )
+                json = json_loads(body)
 
-            json = await response.json()
             hmac = _extract_hmac(json)
+            self.instrumentation.count("hmac_refreshes")
 
-            client_id = json["clients"][0]["id"]
-            return (hmac, client_id)
+            client_ids = [client["id"] for client in json["clients"]]
+            return (hmac, client_ids)
 
-    async def _api_wrapper(
+    async def _signed_request(
         self,
         method: str,
         url: str,
         data: dict | None = None,
         headers: dict | None = None,
+    ) -> tuple[aiohttp.ClientResponse, bytes]:
+        """Send a request signed with the current hmac."""
+        headers = dict(headers or {})
+        hmac = self.hmac
+        headers["Authorization"] = f"HMAC {hmac['user']}:{hmac['hmac']}"
+        headers["X-Hmac-Expires"] = hmac["expires"]
+
+        return await self._transport.request(
+            method,
+            url,
+            headers=headers,
+            json=data,
+        )
+
+    async def _api_wrapper(  # noqa: PLR0913
+        self,
+        method: str,
+        url: str,
+        data: dict | None = None,
+        headers: dict | None = None,
+        request_timeout: float = 30,
+        decoder: Callable[[bytes], Any] = json_loads,
+    ) -> Any:
+        """Get information from the API, retrying idempotent requests."""
+        if method.lower() == "get" and (cached := self.response_cache.fresh(url)):
+            self.instrumentation.count("cache_hits")
+            return cached.view(decoder)
+
+        attempts = self._retry_policy.attempts if method.lower() == "get" else 1
+        attempt = 0
+        while True:
+            if self._rate_limiter:
+                await self._rate_limiter.acquire()
+            if not self.circuit_breaker.allow_request():
+                msg = f"Too many failures, not calling {url} until the API recovers"
+                exception = InfinteNetworksApiClientCircuitOpenError(msg)
+                self.instrumentation.error(exception)
+                raise exception
+            hmac = self._hmac
+            try:
+                result = await self._api_request(
+                    method, url, data, headers, request_timeout, decoder
+                )
+            except InfinteNetworksApiClientError as exception:
+                if isinstance(exception, InfinteNetworksApiClientAuthenticationError):
+                    # Nothing fetched with rejected credentials may be served
+                    self.response_cache.clear()
+                    # The next request should find a renewed hmac, unless a login
+                    # already ran for this one, which would reuse its TOTP step
+                    if self._hmac is hmac and self._relogin_hmac is not hmac:
+                        self._request_refresh()
+                if not _is_retryable(exception):
+                    # The API answered, so it is reachable even though it refused
+                    self.circuit_breaker.record_success()
+                    self.instrumentation.error(exception)
+                    raise
+                self.circuit_breaker.record_failure()
+                self.retry_statistics.last_error = type(exception).__name__
+                attempt += 1
+                if attempt >= attempts:
+                    self.instrumentation.error(exception)
+                    raise
+                delay = self._retry_policy.delay(
+                    attempt - 1, getattr(exception, "retry_after", None)
+                )
+                LOGGER.debug("Retrying %s in %.1fs: %s", url, delay, exception)
+                self.retry_statistics.retries += 1
+                self.retry_statistics.waited += delay
+                await asyncio.sleep(delay)
+            else:
+                self.circuit_breaker.record_success()
+                return result
+
+    def _decode_response(
+        self,
+        method: str,
+        url: str,
+        response: aiohttp.ClientResponse,
+        body: bytes,
+        decoder: Callable[[bytes], Any],
+    ) -> Any:
+        """Decode a response body, reusing the last result if the bytes match."""
+        if method.lower() != "get":
+            return decoder(body)
+        previous = self.response_cache.get(url)
+        cached = self.response_cache.put(
+            url,
+            body,
+            etag=response.headers.get(aiohttp.hdrs.ETAG),
+            last_modified=response.headers.get(aiohttp.hdrs.LAST_MODIFIED),
+        )
+        if cached is previous and decoder in cached.decoded:
+            # Same bytes as last time, skip decoding and hand back the same object
+            self.instrumentation.count("cache_hits")
+        return cached.view(decoder)
+
+    async def _api_request(  # noqa: PLR0913
+        self,
+        method: str,
+        url: str,
+        data: dict | None,
+        headers: dict | None,
+        request_timeout: float,
+        decoder: Callable[[bytes], Any],
     ) -> Any:
-        """Get information from the API."""
+        """Send a single request to the API."""
         try:
-            if not (
-                self._hmac
-                and self._hmac["expires_date"]
-                > datetime.now(self._hmac["expires_date"].tzinfo)
-            ):
+            if not _hmac_is_valid(self._hmac):
                 await self._refresh_hmac_and_client()
-            headers = headers or {}
-            hmac = self.hmac
-            headers["Authorization"] = f"HMAC {hmac['user']}:{hmac['hmac']}"
-            headers["X-Hmac-Expires"] = hmac["expires"]
-
-            response = await self._session.request(
-                method=method,
-                url=url,
-                headers=headers,
-                json=data,
-            )
+
+            cached = self.response_cache.get(url) if method.lower() == "get" else None
+            hmac = self._hmac
+            async with asyncio.timeout(request_timeout):
+                response, body = await self._signed_request(
+                    method,
+                    url,
+                    data,
+                    _conditional_headers(cached, headers) if cached else headers,
+                )
+            if response.status in (401, 403):
+                # The hmac was revoked or the persisted one has expired, wait for
+                # one login shared by every rejected request and retry once. The
+                # login has its own timeouts, the request's would cut it short
+                LOGGER.debug("hmac was rejected, logging in again")
+                self.response_cache.clear()
+                cached = None
+                self._relogin_hmac = hmac
+                if self._hmac is hmac:
+                    await self._refresh_hmac_and_client(force_login=True)
+                async with asyncio.timeout(request_timeout):
+                    response, body = await self._signed_request(
+                        method, url, data, headers
+                    )
+
+            if cached and response.status == 304:  # noqa: PLR2004
+                self.instrumentation.count("cache_hits")
+                self.response_cache.renew(url)
+                return cached.view(decoder)
+
             _verify_response_or_raise(response)
-            return await response.json()
 
+            return self._decode_response(method, url, response, body, decoder)
+
+        except InfinteNetworksApiClientError:
+            raise
         except TimeoutError as exception:
             msg = f"Timeout error fetching information - {exception}"
             raise InfinteNetworksApiClientCommunicationError(
@@ -0,0 +1,134 @@
+"""Bounded response cache of the Infinite Networks API client."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from yarl import URL
+
+from custom_components.integration_infinitenetworks.const import (
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_TTLS,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+    from datetime import timedelta
+
+
+@dataclass(slots=True)
+class InfinteCachedResponse:
+    """The validators, body and decoded views of the last response from a URL."""
+
+    etag: str | None
+    last_modified: str | None
+    body: bytes
+    expires: float
+    # Keyed by decoder, as one URL can be decoded into different views
+    decoded: dict[Callable[[bytes], Any], Any] = field(default_factory=dict)
+
+    def view(self, decoder: Callable[[bytes], Any]) -> Any:
+        """Return the body decoded by the decoder, decoding it once."""
+        if (decoded := self.decoded.get(decoder)) is None:
+            decoded = self.decoded[decoder] = decoder(self.body)
+        return decoded
+
+
+class InfinteResponseCache:
+    """Responses by URL, fresh for a TTL per endpoint, evicted least recently used."""
+
+    def __init__(
+        self,
+        ttls: Mapping[str, timedelta] = RESPONSE_CACHE_TTLS,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+    ) -> None:
+        """Initialize an empty cache."""
+        self.ttls = {endpoint: ttl.total_seconds() for endpoint, ttl in ttls.items()}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._responses: OrderedDict[str, InfinteCachedResponse] = OrderedDict()
+
+    def get(self, url: str) -> InfinteCachedResponse | None:
+        """Return the last response from a URL, fresh or not, for revalidation."""
+        if (cached := self._responses.get(url)) is not None:
+            self._responses.move_to_end(url)
+        return cached
+
+    def fresh(self, url: str) -> InfinteCachedResponse | None:
+        """Return the last response from a URL if it is still fresh."""
+        cached = self.get(url)
+        if cached is not None and cached.expires > time.monotonic():
+            self.hits += 1
+            return cached
+        self.misses += 1
+        return None
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> InfinteCachedResponse:
+        """Store a response, or renew the one with the same body."""
+        expires = time.monotonic() + self.ttls.get(_endpoint(url), 0)
+        cached = self._responses.get(url)
+        if cached is not None and cached.body == body:
+            # Same bytes as last time, keep the decoded views
+            cached.expires = expires
+            cached.etag, cached.last_modified = etag, last_modified
+            self._responses.move_to_end(url)
+            return cached
+
+        self.invalidate(url)
+        cached = self._responses[url] = InfinteCachedResponse(
+            etag=etag, last_modified=last_modified, body=body, expires=expires
+        )
+        self.size += len(body)
+        while self._responses and (
+            len(self._responses) > self.max_entries or self.size > self.max_bytes
+        ):
+            _url, evicted = self._responses.popitem(last=False)
+            self.size -= len(evicted.body)
+            self.evictions += 1
+        return cached
+
+    def renew(self, url: str) -> InfinteCachedResponse | None:
+        """Make the last response from a URL fresh again, after a 304."""
+        if (cached := self.get(url)) is not None:
+            cached.expires = time.monotonic() + self.ttls.get(_endpoint(url), 0)
+        return cached
+
+    def invalidate(self, url: str) -> None:
+        """Drop the response from a URL."""
+        if (cached := self._responses.pop(url, None)) is not None:
+            self.size -= len(cached.body)
+
+    def clear(self) -> None:
+        """Drop every response, e.g. after the credentials were rejected."""
+        self._responses.clear()
+        self.size = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics of the cache."""
+        return {
+            "entries": len(self._responses),
+            "bytes": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def _endpoint(url: str) -> str:
+    """Return the endpoint of an API URL, the last segment of its path."""
+    return URL(url).path.rpartition("/")[2]
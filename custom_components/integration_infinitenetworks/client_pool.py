@@ -0,0 +1,167 @@
+"""Per-account clients of integration_infinitenetworks."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util.ssl import client_context
+from slugify import slugify
+
+from .api import InfinteNetworksApiClient
+from .const import (
+    CONF_FLEET_MODE,
+    CONF_MAX_CONCURRENCY,
+    CONF_MFA_SHARED_SECRET,
+    CONF_RETRY_ATTEMPTS,
+    DEFAULT_FLEET_MODE,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_RETRY_ATTEMPTS,
+    DOMAIN,
+    FLEET_RATE_LIMIT,
+    FLOW_CLIENT_TIMEOUT,
+    LOGGER,
+)
+from .instrumentation import InfinteNetworksInstrumentation
+from .resilience import RetryPolicy, TokenBucket
+from .store import InfinteNetworksCredentialStore
+from .transport import create_session
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+
+    from .data import InfinteNetworksConfigEntry
+
+
+@dataclass
+class InfinteNetworksPooledClient:
+    """An authenticated client of an account, with its own session."""
+
+    client: InfinteNetworksApiClient
+    session: aiohttp.ClientSession
+    cancel_unused_timeout: CALLBACK_TYPE | None = None
+
+    async def async_close(self) -> None:
+        """Close the client and its session."""
+        if self.cancel_unused_timeout:
+            self.cancel_unused_timeout()
+            self.cancel_unused_timeout = None
+        await self.client.async_close()
+        await self.session.close()
+
+
+def account_key(username: str) -> str:
+    """Return the key identifying the account of a username."""
+    return slugify(username)
+
+
+@callback
+def async_create_client(
+    hass: HomeAssistant,
+    data: Mapping[str, Any],
+    options: Mapping[str, Any],
+    reuse: InfinteNetworksPooledClient | None = None,
+) -> InfinteNetworksPooledClient:
+    """Create a client for an account, reusing the session of another if given."""
+    if reuse is None:
+        max_concurrency = options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY)
+        instrumentation = InfinteNetworksInstrumentation()
+        # Every account gets its own cookie jar so SSO sessions never mix
+        session = create_session(
+            limit_per_host=max_concurrency,
+            cookie_jar=aiohttp.CookieJar(),
+            trace_configs=[instrumentation.trace_config()],
+            ssl_context=client_context(),
+            headers={aiohttp.hdrs.USER_AGENT: SERVER_SOFTWARE},
+        )
+    else:
+        reuse.client.close()
+        session = reuse.session
+        session.cookie_jar.clear()
+        instrumentation = reuse.client.instrumentation
+
+    return InfinteNetworksPooledClient(
+        client=InfinteNetworksApiClient(
+            username=data[CONF_USERNAME],
+            password=data[CONF_PASSWORD],
+            mfa_shared_secret=data[CONF_MFA_SHARED_SECRET],
+            session=session,
+            credential_store=InfinteNetworksCredentialStore(hass, data[CONF_USERNAME]),
+            max_concurrency=options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY),
+            retry_policy=RetryPolicy(
+                attempts=options.get(CONF_RETRY_ATTEMPTS, DEFAULT_RETRY_ATTEMPTS)
+            ),
+            instrumentation=instrumentation,
+            rate_limiter=TokenBucket(
+                FLEET_RATE_LIMIT,
+                options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY),
+            )
+            if options.get(CONF_FLEET_MODE, DEFAULT_FLEET_MODE)
+            else None,
+        ),
+        session=session,
+    )
+
+
+@callback
+def async_keep_flow_client(
+    hass: HomeAssistant, username: str, pooled: InfinteNetworksPooledClient
+) -> None:
+    """Keep the logged in client of a config flow for the first setup."""
+    pool: dict[str, InfinteNetworksPooledClient] = hass.data.setdefault(DOMAIN, {})
+    key = account_key(username)
+    if key in pool:
+        hass.async_create_background_task(
+            pooled.async_close(), f"{DOMAIN} close flow client"
+        )
+        return
+
+    async def _async_close_unused(_now: datetime) -> None:
+        pooled.cancel_unused_timeout = None
+        if pool.get(key) is pooled:
+            LOGGER.debug("Closing the unused config flow client of account %s", key)
+            del pool[key]
+            await pooled.async_close()
+
+    pool[key] = pooled
+    pooled.cancel_unused_timeout = async_call_later(
+        hass, FLOW_CLIENT_TIMEOUT, _async_close_unused
+    )
+
+
+@callback
+def async_acquire_client(
+    hass: HomeAssistant,
+    entry: InfinteNetworksConfigEntry,
+) -> InfinteNetworksApiClient:
+    """Return the client of the entry's account, taking over the flow's if kept."""
+    pool: dict[str, InfinteNetworksPooledClient] = hass.data.setdefault(DOMAIN, {})
+    key = account_key(entry.data[CONF_USERNAME])
+
+    # The config flow allows one entry per account, so only the flow's client
+    # of the first setup can be found here
+    if (pooled := pool.get(key)) is None:
+        pooled = pool[key] = async_create_client(hass, entry.data, entry.options)
+    if pooled.cancel_unused_timeout:
+        # The client and session of the config flow are already logged in
+        pooled.cancel_unused_timeout()
+        pooled.cancel_unused_timeout = None
+    return pooled.client
+
+
+async def async_release_client(hass: HomeAssistant, username: str) -> None:
+    """Close the client of an account when its entry unloads."""
+    pool: dict[str, InfinteNetworksPooledClient] = hass.data.get(DOMAIN, {})
+    if (pooled := pool.pop(account_key(username), None)) is None:
+        return
+
+    LOGGER.debug("Closing the client of account %s", account_key(username))
+    await pooled.async_close()
@@ -5,18 +5,40 @@ from __future__ import annotations
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import callback
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from slugify import slugify
 
 from .api import (
-    InfinteNetworksApiClient,
     InfinteNetworksApiClientAuthenticationError,
     InfinteNetworksApiClientCommunicationError,
     InfinteNetworksApiClientError,
     InfinteNetworksApiClientMfaError,
 )
-from .const import CONF_MFA_SHARED_SECRET, DOMAIN, LOGGER
+from .client_pool import (
+    InfinteNetworksPooledClient,
+    async_create_client,
+    async_keep_flow_client,
+)
+from .const import (
+    CONF_FAST_STARTUP,
+    CONF_FLEET_MODE,
+    CONF_MAX_CONCURRENCY,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MFA_SHARED_SECRET,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_RETRY_ATTEMPTS,
+    CONF_STATE_WATCH_INTERVAL,
+    DEFAULT_FAST_STARTUP,
+    DEFAULT_FLEET_MODE,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_RETRY_ATTEMPTS,
+    DEFAULT_STATE_WATCH_INTERVAL,
+    DOMAIN,
+    LOGGER,
+)
 
 
 class InfinteNetworksFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -24,6 +46,16 @@ class InfinteNetworksFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    _pooled: InfinteNetworksPooledClient | None = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,  # noqa: ARG004
+    ) -> InfinteNetworksOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return InfinteNetworksOptionsFlowHandler()
+
     async def async_step_user(
         self,
         user_input: dict | None = None,
@@ -31,6 +63,14 @@ class InfinteNetworksFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle a flow initialized by the user."""
         _errors = {}
         if user_input is not None:
+            await self.async_set_unique_id(
+                ## Do NOT use this in production code
+                ## The unique_id should never be something that can change
+                ## https://developers.home-assistant.io/docs/config_entries_config_flow_handler#unique-ids
+                unique_id=slugify(user_input[CONF_USERNAME])
+            )
+            # Abort before logging in, the account's client has already fetched it all
+            self._abort_if_unique_id_configured()
             try:
                 await self._test_credentials(
                     username=user_input[CONF_USERNAME],
@@ -50,13 +90,12 @@ class InfinteNetworksFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 LOGGER.exception(exception)
                 _errors["base"] = "unknown"
             else:
-                await self.async_set_unique_id(
-                    ## Do NOT use this in production code
-                    ## The unique_id should never be something that can change
-                    ## https://developers.home-assistant.io/docs/config_entries_config_flow_handler#unique-ids
-                    unique_id=slugify(user_input[CONF_USERNAME])
-                )
-                self._abort_if_unique_id_configured()
+                if self._pooled is not None:
+                    # Spare the first setup another login and TLS handshake
+                    async_keep_flow_client(
+                        self.hass, user_input[CONF_USERNAME], self._pooled
+                    )
+                    self._pooled = None
                 return self.async_create_entry(
                     title=user_input[CONF_USERNAME],
                     data=user_input,
@@ -92,11 +131,134 @@ class InfinteNetworksFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     async def _test_credentials(
         self, username: str, password: str, mfa_shared_secret: str
     ) -> None:
-        """Validate credentials."""
-        client = InfinteNetworksApiClient(
-            username=username,
-            password=password,
-            mfa_shared_secret=mfa_shared_secret,
-            session=async_create_clientsession(self.hass),
+        """Validate credentials, reusing the session of earlier attempts."""
+        self._pooled = async_create_client(
+            self.hass,
+            {
+                CONF_USERNAME: username,
+                CONF_PASSWORD: password,
+                CONF_MFA_SHARED_SECRET: mfa_shared_secret,
+            },
+            {},
+            reuse=self._pooled,
+        )
+        await self._pooled.client.async_get_services()
+
+    @callback
+    def async_remove(self) -> None:
+        """Close the client of a flow that did not create an entry."""
+        if self._pooled is not None:
+            self.hass.async_create_background_task(
+                self._pooled.async_close(), f"{DOMAIN} close flow client"
+            )
+            self._pooled = None
+
+
+class InfinteNetworksOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for InfinteNetworks."""
+
+    async def async_step_init(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the polling options."""
+        _errors = {}
+        if user_input is not None:
+            if (
+                user_input[CONF_MIN_UPDATE_INTERVAL]
+                > user_input[CONF_MAX_UPDATE_INTERVAL]
+            ):
+                _errors["base"] = "interval"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        options = user_input or self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_MIN_UPDATE_INTERVAL,
+                        default=options.get(
+                            CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL
+                        ),
+                    ): _minutes_selector(),
+                    vol.Required(
+                        CONF_MAX_UPDATE_INTERVAL,
+                        default=options.get(
+                            CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL
+                        ),
+                    ): _minutes_selector(),
+                    vol.Required(
+                        CONF_MAX_CONCURRENCY,
+                        default=options.get(
+                            CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY
+                        ),
+                    ): vol.All(
+                        selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=1,
+                                max=32,
+                                mode=selector.NumberSelectorMode.BOX,
+                            ),
+                        ),
+                        vol.Coerce(int),
+                    ),
+                    vol.Required(
+                        CONF_RETRY_ATTEMPTS,
+                        default=options.get(
+                            CONF_RETRY_ATTEMPTS, DEFAULT_RETRY_ATTEMPTS
+                        ),
+                    ): vol.All(
+                        selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=1,
+                                max=10,
+                                mode=selector.NumberSelectorMode.BOX,
+                            ),
+                        ),
+                        vol.Coerce(int),
+                    ),
+                    vol.Required(
+                        CONF_STATE_WATCH_INTERVAL,
+                        default=options.get(
+                            CONF_STATE_WATCH_INTERVAL, DEFAULT_STATE_WATCH_INTERVAL
+                        ),
+                    ): vol.All(
+                        selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=0,
+                                max=3600,
+                                mode=selector.NumberSelectorMode.BOX,
+                                unit_of_measurement="s",
+                            ),
+                        ),
+                        vol.Coerce(int),
+                    ),
+                    vol.Required(
+                        CONF_FAST_STARTUP,
+                        default=options.get(CONF_FAST_STARTUP, DEFAULT_FAST_STARTUP),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_FLEET_MODE,
+                        default=options.get(CONF_FLEET_MODE, DEFAULT_FLEET_MODE),
+                    ): selector.BooleanSelector(),
+                },
+            ),
+            errors=_errors,
         )
-        await client.async_get_service()
+
+
+def _minutes_selector() -> vol.All:
+    """Return a selector for an interval in minutes."""
+    return vol.All(
+        selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=1,
+                max=1440,
+                mode=selector.NumberSelectorMode.BOX,
+                unit_of_measurement="min",
+            ),
+        ),
+        vol.Coerce(int),
+    )
@@ -1,8 +1,62 @@
 """Constants for integration_infinitenetworks."""
 
+from datetime import timedelta
 from logging import Logger, getLogger
 
 LOGGER: Logger = getLogger(__package__)
 
 DOMAIN = "integration_infinitenetworks"
+SSO_URL = "https://sso.infinite.net.au"
+API_URL = "https://invocation.infinite.net.au"
 CONF_MFA_SHARED_SECRET = "mfa_shared_secret"  # noqa: S105
+CONF_MAX_CONCURRENCY = "max_concurrency"
+CONF_MIN_UPDATE_INTERVAL = "min_update_interval"
+CONF_MAX_UPDATE_INTERVAL = "max_update_interval"
+CONF_RETRY_ATTEMPTS = "retry_attempts"
+CONF_FAST_STARTUP = "fast_startup"
+CONF_STATE_WATCH_INTERVAL = "state_watch_interval"
+CONF_FLEET_MODE = "fleet_mode"
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MIN_UPDATE_INTERVAL = 5  # minutes
+DEFAULT_MAX_UPDATE_INTERVAL = 60  # minutes
+DEFAULT_RETRY_ATTEMPTS = 3
+DEFAULT_FAST_STARTUP = False
+DEFAULT_STATE_WATCH_INTERVAL = 0  # seconds, 0 disables the state watcher
+DEFAULT_FLEET_MODE = False
+
+FLEET_SLOT_SIZE = 25  # services polled per tick in fleet mode
+FLEET_RATE_LIMIT = 5  # details requests per second in fleet mode
+
+UPDATE_INTERVAL_BACKOFF = 2
+UPDATE_INTERVAL_JITTER = 0.1
+
+EVENT_SERVICE_STATE_CHANGED = f"{DOMAIN}_service_state_changed"
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.credentials"
+
+HTTP_DNS_CACHE_TTL = 300  # seconds
+HTTP_KEEPALIVE_TIMEOUT = 60  # seconds
+API_WARMUP_TIMEOUT = 10  # seconds
+FLOW_CLIENT_TIMEOUT = timedelta(minutes=5)
+
+SERVICE_CACHE_TTL = timedelta(hours=24)
+# Freshness of the API responses every consumer shares, by endpoint. Details
+# stay fresh for less than the state watcher interval, so it still sees changes
+RESPONSE_CACHE_TTLS = {
+    "services": timedelta(minutes=5),
+    "details": timedelta(seconds=20),
+}
+RESPONSE_CACHE_MAX_ENTRIES = 512
+RESPONSE_CACHE_MAX_BYTES = 2 * 1024 * 1024
+HMAC_REFRESH_MARGIN = timedelta(minutes=5)
+HMAC_REFRESH_RETRY = timedelta(minutes=1)
+
+HISTORY_CAPACITY = 2048
+HISTORY_SAVE_INTERVAL = timedelta(minutes=15)
+ANALYTICS_WINDOW = timedelta(hours=24)
+# The last good details are shown, flagged stale, for this long after they were
+# fetched while the updates fail, including across restarts
+SNAPSHOT_MAX_AGE = timedelta(hours=24)
+SNAPSHOT_VERSION = 1
@@ -2,37 +2,289 @@
 
 from __future__ import annotations
 
+import random
+import time
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import (
     InfinteNetworksApiClientAuthenticationError,
     InfinteNetworksApiClientError,
+    VisionDetails,
 )
+from .const import (
+    FLEET_SLOT_SIZE,
+    SNAPSHOT_MAX_AGE,
+    UPDATE_INTERVAL_BACKOFF,
+    UPDATE_INTERVAL_JITTER,
+)
+from .fleet import FleetScheduler
+from .snapshot import DetailsSnapshot
 
 if TYPE_CHECKING:
+    import asyncio
+    from datetime import timedelta
+    from logging import Logger
+
+    from homeassistant.core import HomeAssistant
+
+    from .api import InfiniteService
     from .data import InfinteNetworksConfigEntry
 
+# Changes to these details poll fast, stable values back off towards the max interval
+ADAPTIVE_KEYS = (
+    "service_state",
+    "last_status_change",
+    "actual_line_rate_up",
+    "actual_line_rate_down",
+)
+
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
 class InfinteNetworksDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the API."""
 
     config_entry: InfinteNetworksConfigEntry
+    services: list[InfiniteService]
+
+    def __init__(  # noqa: PLR0913
+        self,
+        hass: HomeAssistant,
+        logger: Logger,
+        *,
+        name: str,
+        min_interval: timedelta,
+        max_interval: timedelta,
+        always_update: bool = True,
+    ) -> None:
+        """Initialize the coordinator, polling fast until the values settle."""
+        super().__init__(
+            hass=hass,
+            logger=logger,
+            name=name,
+            update_interval=min_interval,
+            always_update=always_update,
+        )
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._base_interval = min_interval
+        self._fingerprint: dict[int, tuple[Any, ...]] | None = None
+        # (service ID, details key) pairs changed by the last update, None for all
+        # or once the listeners were notified
+        self._changes: set[tuple[int, str]] | None = None
+        self._pending_changes: set[tuple[int, str]] | None = set()
+        self._notified_success = True
+        self._notified_stale = False
+        self._notify_handle: asyncio.Handle | None = None
+        # Seconds since the epoch the data was fetched, and whether it was
+        # restored from the snapshot rather than fetched since the start
+        self.data_fetched: float | None = None
+        self._restored = False
+
+    @property
+    def stale(self) -> bool:
+        """Return True if the data predates the last update, but is still shown."""
+        return (
+            self.data_fetched is not None
+            and (self._restored or not self.last_update_success)
+            and time.time() - self.data_fetched < SNAPSHOT_MAX_AGE.total_seconds()
+        )
+
+    @callback
+    def async_restore_snapshot(self, snapshot: DetailsSnapshot) -> None:
+        """Start from the details of the last run, before the first refresh."""
+        self.services = snapshot.services
+        self.data = snapshot.data
+        self.data_fetched = snapshot.fetched
+        self._restored = True
+        # The entities are added after the restore, showing the data as stale
+        self._notified_stale = self.stale
+
+    def snapshot(self) -> DetailsSnapshot | None:
+        """Return the services and details of the last successful update."""
+        if self.data is None or self.data_fetched is None:
+            return None
+        return DetailsSnapshot(self.data_fetched, self.services, self.data)
 
-    async def _async_update_data(self) -> Any:
-        """Update data via library."""
+    async def _async_update_data(self) -> dict[int, VisionDetails]:
+        """Update data via library, returns the Vision details keyed by service ID."""
+        client = self.config_entry.runtime_data.client
         try:
-            self.infinite_service = (
-                await self.config_entry.runtime_data.client.async_get_service()
-            )
+            self.services = await client.async_get_services()
+
+            data = await client.async_get_all_vision_details(self.services)
+        except InfinteNetworksApiClientAuthenticationError as exception:
+            raise ConfigEntryAuthFailed(exception) from exception
+        except InfinteNetworksApiClientError as exception:
+            raise UpdateFailed(exception) from exception
+
+        self._record(data, data)
+        return data
+
+    def _record(
+        self, fetched: dict[int, VisionDetails], data: dict[int, VisionDetails]
+    ) -> None:
+        """Record the fetched details and the changes of the new data."""
+        now = time.time()
+        self.config_entry.runtime_data.history.record(int(now), fetched)
+        self.config_entry.runtime_data.analytics.record(fetched)
+        self._adapt_update_interval(data)
+        self._changes = _changed_keys(self.data, data)
+        self.data_fetched = now
+        self._restored = False
 
-            return await self.config_entry.runtime_data.client.async_get_vision_details(
-                self.infinite_service
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh, notifying the context-less entities of every update."""
+        await super()._async_refresh(*args, **kwargs)
+        # Without always_update, unchanged data notifies nobody, but the windows
+        # of the context-less entities moved, and the stale flag may have cleared
+        if self._changes is not None or self.stale != self._notified_stale:
+            self.async_update_listeners()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify the entities of the changed keys, batched into one callback."""
+        changes, self._changes = self._changes, None
+        stale = self.stale
+        if (
+            changes is None
+            or self.last_update_success != self._notified_success
+            or stale != self._notified_stale
+        ):
+            # Availability or staleness changed, every entity is affected
+            self._pending_changes = None
+        elif self._pending_changes is not None:
+            self._pending_changes |= changes
+        self._notified_success = self.last_update_success
+        self._notified_stale = stale
+        if self._notify_handle is None:
+            self._notify_handle = self.hass.loop.call_soon(self._async_notify_listeners)
+
+    @callback
+    def _async_notify_listeners(self) -> None:
+        """Call the listeners whose context changed since the last notification."""
+        changes, self._pending_changes = self._pending_changes, set()
+        self._notify_handle = None
+        for update_callback, context in list(self._listeners.values()):
+            if changes is None or context is None or context in changes:
+                update_callback()
+
+    async def async_shutdown(self) -> None:
+        """Cancel a pending notification."""
+        await super().async_shutdown()
+        if self._notify_handle is not None:
+            self._notify_handle.cancel()
+            self._notify_handle = None
+
+    @callback
+    def async_poll_fast(self) -> None:
+        """Drop back to the minimum interval, e.g. after a state change."""
+        self._base_interval = self.min_interval
+        self.update_interval = self._jittered(self._base_interval)
+
+    def _adapt_update_interval(self, data: dict[int, VisionDetails]) -> None:
+        """Poll fast after a change and back off exponentially while stable."""
+        fingerprint = {
+            service_id: tuple(getattr(details, key) for key in ADAPTIVE_KEYS)
+            for service_id, details in data.items()
+        }
+        if self._fingerprint is not None and fingerprint != self._fingerprint:
+            self.logger.debug("Vision details changed, polling fast")
+            self._base_interval = self.min_interval
+        elif self._fingerprint is not None:
+            self._base_interval = min(
+                self._base_interval * UPDATE_INTERVAL_BACKOFF, self.max_interval
             )
+        self._fingerprint = fingerprint
+        self.update_interval = self._jittered(self._base_interval)
+
+    def _jittered(self, interval: timedelta) -> timedelta:
+        """Spread the polls of different entries so they do not fire together."""
+        jitter = random.uniform(-UPDATE_INTERVAL_JITTER, UPDATE_INTERVAL_JITTER)  # noqa: S311
+        return min(max(interval * (1 + jitter), self.min_interval), self.max_interval)
+
+
+class InfinteNetworksFleetCoordinator(InfinteNetworksDataUpdateCoordinator):
+    """Poll many services a slot at a time, instead of all of them at once."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        hass: HomeAssistant,
+        logger: Logger,
+        *,
+        name: str,
+        min_interval: timedelta,
+        max_interval: timedelta,
+        always_update: bool = True,
+        slot_size: int = FLEET_SLOT_SIZE,
+    ) -> None:
+        """Initialize the coordinator, ticking once per slot of services."""
+        self.scheduler = FleetScheduler(slot_size)
+        self._slot_count = 1
+        super().__init__(
+            hass,
+            logger,
+            name=name,
+            min_interval=min_interval,
+            max_interval=max_interval,
+            always_update=always_update,
+        )
+
+    async def _async_update_data(self) -> dict[int, VisionDetails]:
+        """Poll the services due this tick, keeping the details of the others."""
+        client = self.config_entry.runtime_data.client
+        try:
+            self.services = await client.async_get_services()
         except InfinteNetworksApiClientAuthenticationError as exception:
             raise ConfigEntryAuthFailed(exception) from exception
         except InfinteNetworksApiClientError as exception:
             raise UpdateFailed(exception) from exception
+        self._slot_count = self.scheduler.slot_count(self.services)
+
+        previous = self.data or {}
+        details, failures = await self.scheduler.async_poll(
+            client, self.scheduler.due(self.services, previous)
+        )
+        if failures and not details:
+            exception = next(iter(failures.values()))
+            if all(
+                isinstance(failure, InfinteNetworksApiClientAuthenticationError)
+                for failure in failures.values()
+            ):
+                raise ConfigEntryAuthFailed(exception) from exception
+            raise UpdateFailed(exception) from exception
+        for service_id, exception in failures.items():
+            self.logger.debug("Polling service %s failed: %s", service_id, exception)
+
+        # Failed services turn unavailable until a retry succeeds
+        service_ids = {service.id for service in self.services}
+        data = {
+            service_id: service_details
+            for service_id, service_details in previous.items()
+            if service_id in service_ids and service_id not in failures
+        } | details
+        self._record(details, data)
+        return data
+
+    def _jittered(self, interval: timedelta) -> timedelta:
+        """Tick once per slot, so every service is polled once per interval."""
+        return super()._jittered(interval) / self._slot_count
+
+
+def _changed_keys(
+    previous: dict[int, VisionDetails] | None, data: dict[int, VisionDetails]
+) -> set[tuple[int, str]] | None:
+    """Return the (service ID, details key) pairs that differ, None for all."""
+    if previous is None:
+        return None
+    added_or_removed = previous.keys() ^ data.keys()
+    return {
+        (service_id, key)
+        for service_id in previous.keys() | data.keys()
+        for key in VisionDetails.__slots__
+        if service_id in added_or_removed
+        or getattr(previous[service_id], key) != getattr(data[service_id], key)
+    }
@@ -9,8 +9,10 @@ if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.loader import Integration
 
+    from .analytics import LineQualityAnalytics
     from .api import InfinteNetworksApiClient
     from .coordinator import InfinteNetworksDataUpdateCoordinator
+    from .history import LineRateHistory
 
 
 type InfinteNetworksConfigEntry = ConfigEntry[InfinteNetworksData]
@@ -23,3 +25,5 @@ class InfinteNetworksData:
     client: InfinteNetworksApiClient
     coordinator: InfinteNetworksDataUpdateCoordinator
     integration: Integration
+    history: LineRateHistory
+    analytics: LineQualityAnalytics
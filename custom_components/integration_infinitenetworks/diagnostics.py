@@ -0,0 +1,60 @@
+"""Diagnostics support for integration_infinitenetworks."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+
+from .const import CONF_MFA_SHARED_SECRET
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import InfinteNetworksConfigEntry
+
+TO_REDACT = {
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    CONF_MFA_SHARED_SECRET,
+    "identifier",
+    "router_cpe_mac",
+    "ntu_cpe_mac",
+    "ntu_cpe_serial",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
+    entry: InfinteNetworksConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    client = entry.runtime_data.client
+    coordinator = entry.runtime_data.coordinator
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "instrumentation": client.instrumentation.as_dict(),
+        "retries": client.retry_statistics.as_dict(),
+        "circuit_breaker": client.circuit_breaker.as_dict(),
+        "response_cache": client.response_cache.as_dict(),
+        "coordinator": {
+            "update_interval": str(coordinator.update_interval),
+            "last_update_success": coordinator.last_update_success,
+            "stale": coordinator.stale,
+            "services": [
+                {"id": service.id, "client_id": service.client_id}
+                for service in coordinator.services
+            ],
+            "data": async_redact_data(
+                {
+                    service_id: details.as_dict()
+                    for service_id, details in (coordinator.data or {}).items()
+                },
+                TO_REDACT,
+            ),
+        },
+    }
@@ -2,24 +2,73 @@
 
 from __future__ import annotations
 
-from homeassistant.helpers.device_registry import DeviceInfo
+from typing import TYPE_CHECKING
+
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .coordinator import InfinteNetworksDataUpdateCoordinator
 
+if TYPE_CHECKING:
+    from .api import InfiniteService
+
 
 class InfinteNetworksEntity(CoordinatorEntity[InfinteNetworksDataUpdateCoordinator]):
     """InfinteNetworksEntity class."""
 
+    def __init__(
+        self,
+        coordinator: InfinteNetworksDataUpdateCoordinator,
+        infinite_service: InfiniteService,
+        context: tuple[int, str] | None = None,
+    ) -> None:
+        """Initialize, listening to the details key in the context or to all."""
+        super().__init__(coordinator, context)
+        self.infinite_service = infinite_service
+        self._attr_unique_id = (
+            f"{coordinator.config_entry.entry_id}_{infinite_service.id}"
+        )
+        self._attr_device_info = DeviceInfo(
+            identifiers={
+                (
+                    coordinator.config_entry.domain,
+                    self._attr_unique_id,
+                ),
+            },
+            name=infinite_service.identifier,
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True if the service is part of the latest or the stale data."""
+        return (
+            (super().available or self.coordinator.stale)
+            and self.coordinator.data is not None
+            and self.infinite_service.id in self.coordinator.data
+        )
+
+
+class InfinteNetworksAccountEntity(
+    CoordinatorEntity[InfinteNetworksDataUpdateCoordinator]
+):
+    """InfinteNetworksAccountEntity class, for entities describing the account."""
+
     def __init__(self, coordinator: InfinteNetworksDataUpdateCoordinator) -> None:
         """Initialize."""
         super().__init__(coordinator)
-        self._attr_unique_id = coordinator.config_entry.entry_id
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_account"
         self._attr_device_info = DeviceInfo(
             identifiers={
                 (
                     coordinator.config_entry.domain,
-                    coordinator.config_entry.entry_id,
+                    self._attr_unique_id,
                 ),
             },
+            name=coordinator.config_entry.title,
+            entry_type=DeviceEntryType.SERVICE,
         )
+
+    @property
+    def available(self) -> bool:
+        """Return True, the account diagnostics matter most when updates fail."""
+        return True
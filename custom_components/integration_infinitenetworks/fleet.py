@@ -0,0 +1,78 @@
+"""Time-sliced polling of many Infinite Networks services."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from operator import attrgetter
+from typing import TYPE_CHECKING
+
+from custom_components.integration_infinitenetworks.api import (
+    InfinteNetworksApiClientError,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Container
+
+    from custom_components.integration_infinitenetworks.api import (
+        InfiniteService,
+        InfinteNetworksApiClient,
+        VisionDetails,
+    )
+
+
+class FleetScheduler:
+    """Spread the details polls of many services evenly over time slots."""
+
+    def __init__(self, slot_size: int) -> None:
+        """Initialize the scheduler with the number of services per slot."""
+        self.slot_size = slot_size
+        self.retry: set[int] = set()
+        self._slot = 0
+
+    def slot_count(self, services: list[InfiniteService]) -> int:
+        """Return the number of slots a full round over the services takes."""
+        return max(1, math.ceil(len(services) / self.slot_size))
+
+    def due(
+        self, services: list[InfiniteService], polled: Container[int]
+    ) -> list[InfiniteService]:
+        """Return the services of the current slot, the failed and the new ones."""
+        slot_count = self.slot_count(services)
+        slot = self._slot % slot_count
+        # Sorted by ID so a service keeps its slot while others come and go
+        return [
+            service
+            for index, service in enumerate(sorted(services, key=attrgetter("id")))
+            if index % slot_count == slot
+            or service.id in self.retry
+            or service.id not in polled
+        ]
+
+    def advance(self) -> None:
+        """Move to the next slot."""
+        self._slot += 1
+
+    async def async_poll(
+        self, client: InfinteNetworksApiClient, services: list[InfiniteService]
+    ) -> tuple[dict[int, VisionDetails], dict[int, InfinteNetworksApiClientError]]:
+        """Poll the services and move to the next slot, returning the failures too."""
+        results = await asyncio.gather(
+            *(client.async_get_vision_details(service) for service in services),
+            return_exceptions=True,
+        )
+        self.advance()
+
+        details: dict[int, VisionDetails] = {}
+        failures: dict[int, InfinteNetworksApiClientError] = {}
+        for service, result in zip(services, results, strict=True):
+            if isinstance(result, InfinteNetworksApiClientError):
+                failures[service.id] = result
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                details[service.id] = result
+        # Failed services are retried on the next tick, whatever their slot
+        self.retry -= details.keys()
+        self.retry |= failures.keys()
+        return details, failures
@@ -0,0 +1,265 @@
+"""Line rate history for integration_infinitenetworks."""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .const import DOMAIN, HISTORY_CAPACITY, LOGGER
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .api import VisionDetails
+
+HISTORY_METRICS = (
+    "actual_line_rate_up",
+    "actual_line_rate_down",
+    "attainable_line_rate_up",
+    "attainable_line_rate_down",
+)
+HISTORY_WINDOWS = {
+    "1h": timedelta(hours=1),
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+}
+
+# magic, format version, byte order, capacity, buffer count
+_HEADER = struct.Struct("<4sBcII")
+# service ID, metric index, start, size
+_BUFFER_HEADER = struct.Struct("<QBxxxII")
+# service count, then per service: service ID, status change count
+_STATUS_COUNT = struct.Struct("<I")
+_STATUS_HEADER = struct.Struct("<QI")
+_MAGIC = b"INLH"
+# Version 1 has no status changes
+_VERSION = 2
+_BYTE_ORDER = b"<" if sys.byteorder == "little" else b">"
+
+
+class WindowAggregate(NamedTuple):
+    """Minimum, maximum and mean of the samples in a time window."""
+
+    minimum: float
+    maximum: float
+    mean: float
+
+
+class RingBuffer:
+    """Fixed-size ring buffer of samples, backed by arrays."""
+
+    __slots__ = ("capacity", "size", "start", "timestamps", "values")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty ring buffer."""
+        self.capacity = capacity
+        self.start = 0
+        self.size = 0
+        # Seconds since the epoch and float32 values, 8 bytes per sample
+        self.timestamps = array("I", bytes(4 * capacity))
+        self.values = array("f", bytes(4 * capacity))
+
+    def append(self, timestamp: int, value: float) -> None:
+        """Add a sample, overwriting the oldest one when full."""
+        index = (self.start + self.size) % self.capacity
+        self.timestamps[index] = timestamp
+        self.values[index] = value
+        if self.size < self.capacity:
+            self.size += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+
+    def ordered(self) -> tuple[array, array]:
+        """Return the timestamps and values, oldest first."""
+        end = self.start + self.size
+        if end <= self.capacity:
+            return self.timestamps[self.start : end], self.values[self.start : end]
+        end -= self.capacity
+        return (
+            self.timestamps[self.start :] + self.timestamps[:end],
+            self.values[self.start :] + self.values[:end],
+        )
+
+    def since(self, timestamp: int) -> array:
+        """Return the values recorded at or after the timestamp."""
+        timestamps, values = self.ordered()
+        return values[bisect_left(timestamps, timestamp) :]
+
+
+class LineRateHistory:
+    """Line rate samples of every service, kept in ring buffers per metric."""
+
+    def __init__(self, capacity: int = HISTORY_CAPACITY) -> None:
+        """Initialize an empty history."""
+        self.capacity = capacity
+        self.buffers: dict[tuple[int, str], RingBuffer] = {}
+        # Seconds since the epoch of each distinct last status change, oldest
+        # first, recorded by the analytics and saved with the samples
+        self.status_changes: dict[int, array] = {}
+        self._aggregates: dict[tuple[int, str, int], WindowAggregate | None] = {}
+        self.dirty = False
+
+    def record(self, timestamp: int, data: dict[int, VisionDetails]) -> None:
+        """Record the line rates of every service in an update."""
+        for service_id, details in data.items():
+            for metric in HISTORY_METRICS:
+                value = getattr(details, metric, None)
+                if not isinstance(value, int | float):
+                    continue
+                if (buffer := self.buffers.get((service_id, metric))) is None:
+                    buffer = self.buffers[(service_id, metric)] = RingBuffer(
+                        self.capacity
+                    )
+                buffer.append(timestamp, value)
+        self._aggregates.clear()
+        self.dirty = True
+
+    def aggregate(
+        self, service_id: int, metric: str, window: int, now: int
+    ) -> WindowAggregate | None:
+        """Return the aggregate of the last window seconds, cached until a record."""
+        key = (service_id, metric, window)
+        if key not in self._aggregates:
+            buffer = self.buffers.get((service_id, metric))
+            values = buffer.since(now - window) if buffer else None
+            self._aggregates[key] = (
+                WindowAggregate(min(values), max(values), sum(values) / len(values))
+                if values
+                else None
+            )
+        return self._aggregates[key]
+
+    def to_bytes(self) -> bytes:
+        """Serialize the history into its compact binary format."""
+        parts = [
+            _HEADER.pack(
+                _MAGIC, _VERSION, _BYTE_ORDER, self.capacity, len(self.buffers)
+            )
+        ]
+        for (service_id, metric), buffer in self.buffers.items():
+            parts.append(
+                _BUFFER_HEADER.pack(
+                    service_id,
+                    HISTORY_METRICS.index(metric),
+                    buffer.start,
+                    buffer.size,
+                )
+            )
+            parts.append(buffer.timestamps.tobytes())
+            parts.append(buffer.values.tobytes())
+        parts.append(_STATUS_COUNT.pack(len(self.status_changes)))
+        for service_id, changes in self.status_changes.items():
+            parts.append(_STATUS_HEADER.pack(service_id, len(changes)))
+            parts.append(changes.tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_buffer(cls, data: memoryview) -> LineRateHistory:
+        """Load a history from its binary format."""
+        magic, version, byte_order, capacity, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version not in (1, _VERSION) or byte_order != _BYTE_ORDER:
+            msg = "Unsupported line rate history format"
+            raise ValueError(msg)
+
+        history = cls(capacity)
+        offset = _HEADER.size
+        for _ in range(count):
+            service_id, metric_index, start, size = _BUFFER_HEADER.unpack_from(
+                data, offset
+            )
+            offset += _BUFFER_HEADER.size
+            buffer = RingBuffer(capacity)
+            buffer.start, buffer.size = start, size
+            for samples in (buffer.timestamps, buffer.values):
+                length = capacity * samples.itemsize
+                # Copy straight out of the mapped pages into the array
+                samples[:] = array(samples.typecode)
+                samples.frombytes(data[offset : offset + length])
+                offset += length
+            if len(buffer.values) != capacity or metric_index >= len(HISTORY_METRICS):
+                msg = "Truncated or corrupt line rate history"
+                raise ValueError(msg)
+            history.buffers[(service_id, HISTORY_METRICS[metric_index])] = buffer
+        if version > 1:
+            history.status_changes = _status_changes_from_buffer(data, offset)
+        return history
+
+
+def _status_changes_from_buffer(data: memoryview, offset: int) -> dict[int, array]:
+    """Load the status changes that follow the buffers."""
+    (count,) = _STATUS_COUNT.unpack_from(data, offset)
+    offset += _STATUS_COUNT.size
+    status_changes = {}
+    for _ in range(count):
+        service_id, size = _STATUS_HEADER.unpack_from(data, offset)
+        offset += _STATUS_HEADER.size
+        changes = array("I")
+        length = size * changes.itemsize
+        changes.frombytes(data[offset : offset + length])
+        offset += length
+        if len(changes) != size:
+            msg = "Truncated or corrupt line rate history"
+            raise ValueError(msg)
+        status_changes[service_id] = changes
+    return status_changes
+
+
+def load_history(path: Path) -> LineRateHistory:
+    """Load the history by memory-mapping its file, run in the executor."""
+    try:
+        with (
+            path.open("rb") as file,
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+            memoryview(mapped) as data,
+        ):
+            return LineRateHistory.from_buffer(data)
+    except (OSError, ValueError, struct.error) as exception:
+        if not isinstance(exception, FileNotFoundError):
+            LOGGER.warning("Discarding line rate history %s: %s", path, exception)
+        return LineRateHistory()
+
+
+def save_history(path: Path, data: bytes) -> None:
+    """Write the history atomically, run in the executor."""
+    temp_path = path.with_suffix(".tmp")
+    temp_path.write_bytes(data)
+    temp_path.replace(path)
+
+
+async def async_load_history(hass: HomeAssistant, entry_id: str) -> LineRateHistory:
+    """Load the line rate history of a config entry."""
+    return await hass.async_add_executor_job(
+        load_history, _history_path(hass, entry_id)
+    )
+
+
+async def async_save_history(
+    hass: HomeAssistant, entry_id: str, history: LineRateHistory
+) -> None:
+    """Save the line rate history of a config entry if it changed."""
+    if not history.dirty:
+        return
+    history.dirty = False
+    await hass.async_add_executor_job(
+        save_history, _history_path(hass, entry_id), history.to_bytes()
+    )
+
+
+async def async_remove_history(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the line rate history of a config entry."""
+    await hass.async_add_executor_job(
+        partial(_history_path(hass, entry_id).unlink, missing_ok=True)
+    )
+
+
+def _history_path(hass: HomeAssistant, entry_id: str) -> Path:
+    return Path(hass.config.path(STORAGE_DIR, f"{DOMAIN}.history.{entry_id}"))
@@ -0,0 +1,178 @@
+"""Timing and counter instrumentation for the Infinite Networks API client."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from types import SimpleNamespace
+
+# Counters are kept in 5 minute buckets for a rolling 24 hours
+ROLLING_WINDOW = 24 * 60 * 60
+ROLLING_BUCKET = 5 * 60
+
+
+@dataclass
+class SpanStatistics:
+    """Durations recorded for one kind of span."""
+
+    count: int = 0
+    total: float = 0.0
+    last: float = 0.0
+    maximum: float = 0.0
+
+    def record(self, duration: float) -> None:
+        """Record the duration of a finished span."""
+        self.count += 1
+        self.total += duration
+        self.last = duration
+        self.maximum = max(self.maximum, duration)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics in milliseconds."""
+        return {
+            "count": self.count,
+            "last_ms": round(self.last * 1000, 1),
+            "mean_ms": round(self.total / self.count * 1000, 1) if self.count else 0,
+            "max_ms": round(self.maximum * 1000, 1),
+        }
+
+
+class RollingCounter:
+    """Counter with an all-time total and a total over a rolling window."""
+
+    __slots__ = ("_buckets", "total")
+
+    def __init__(self) -> None:
+        """Initialize the counter."""
+        self.total = 0
+        self._buckets: deque[list[int]] = deque()
+
+    def add(self, amount: int = 1) -> None:
+        """Add to the counter."""
+        self.total += amount
+        bucket = int(time.time()) // ROLLING_BUCKET
+        if self._buckets and self._buckets[-1][0] == bucket:
+            self._buckets[-1][1] += amount
+        else:
+            self._buckets.append([bucket, amount])
+        self._expire(bucket)
+
+    @property
+    def recent(self) -> int:
+        """Return the count within the rolling window."""
+        self._expire(int(time.time()) // ROLLING_BUCKET)
+        return sum(count for _bucket, count in self._buckets)
+
+    def _expire(self, bucket: int) -> None:
+        oldest = bucket - ROLLING_WINDOW // ROLLING_BUCKET
+        while self._buckets and self._buckets[0][0] <= oldest:
+            self._buckets.popleft()
+
+
+class InfinteNetworksInstrumentation:
+    """
+    Collect timing spans and rolling counters for the API client.
+
+    Subclass and override span, count and error to forward the measurements to
+    another metrics system.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty spans and counters."""
+        self.spans: dict[str, SpanStatistics] = {}
+        self.counters: dict[str, RollingCounter] = {}
+        self.errors: dict[str, RollingCounter] = {}
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the body of the context, also when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_span(name, time.perf_counter() - start)
+
+    def record_span(self, name: str, duration: float) -> None:
+        """Record the duration of a span."""
+        self.spans.setdefault(name, SpanStatistics()).record(duration)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add to a counter."""
+        self.counters.setdefault(name, RollingCounter()).add(amount)
+
+    def error(self, exception: BaseException) -> None:
+        """Count an error by its exception class."""
+        self.errors.setdefault(type(exception).__name__, RollingCounter()).add()
+
+    def counter_total(self, name: str) -> int:
+        """Return the all-time total of a counter."""
+        return counter.total if (counter := self.counters.get(name)) else 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Return a trace config timing the DNS and connection phases."""
+        trace_config = aiohttp.TraceConfig()
+
+        def _phase(name: str) -> tuple[Any, Any]:
+            async def on_start(
+                _session: aiohttp.ClientSession, context: SimpleNamespace, _params: Any
+            ) -> None:
+                setattr(context, name, time.perf_counter())
+
+            async def on_end(
+                _session: aiohttp.ClientSession, context: SimpleNamespace, _params: Any
+            ) -> None:
+                if (start := getattr(context, name, None)) is not None:
+                    self.record_span(name, time.perf_counter() - start)
+
+            return on_start, on_end
+
+        for name, start_signal, end_signal in (
+            (
+                "dns",
+                trace_config.on_dns_resolvehost_start,
+                trace_config.on_dns_resolvehost_end,
+            ),
+            (
+                "connection_queued",
+                trace_config.on_connection_queued_start,
+                trace_config.on_connection_queued_end,
+            ),
+            (
+                "connection_create",
+                trace_config.on_connection_create_start,
+                trace_config.on_connection_create_end,
+            ),
+        ):
+            on_start, on_end = _phase(name)
+            start_signal.append(on_start)
+            end_signal.append(on_end)
+
+        async def on_reuse(
+            _session: aiohttp.ClientSession, _context: SimpleNamespace, _params: Any
+        ) -> None:
+            self.count("connections_reused")
+
+        trace_config.on_connection_reuseconn.append(on_reuse)
+        return trace_config
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return every span and counter for diagnostics."""
+        return {
+            "spans": {name: stats.as_dict() for name, stats in self.spans.items()},
+            "counters": {
+                name: {"total": counter.total, "last_24h": counter.recent}
+                for name, counter in self.counters.items()
+            },
+            "errors": {
+                name: {"total": counter.total, "last_24h": counter.recent}
+                for name, counter in self.errors.items()
+            },
+        }
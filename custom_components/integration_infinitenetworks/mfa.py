@@ -0,0 +1,86 @@
+"""MFA form helpers for the Infinite Networks SSO login."""
+
+from __future__ import annotations
+
+import html
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import aiohttp
+
+MFA_TOKEN_ID = "two_factor_login__token"  # noqa: S105 The id of the input
+# Seconds each TOTP code is valid for, and the least left worth logging in with
+TOTP_STEP = 30
+TOTP_MIN_VALIDITY = 5
+
+_MFA_TOKEN_TAG = re.compile(
+    rb"<input\b[^>]*?(?<![\w-])id\s*=\s*[\"']?" + MFA_TOKEN_ID.encode() + rb"\b[^>]*>",
+    re.IGNORECASE,
+)
+_MFA_TOKEN_VALUE = re.compile(
+    rb"(?<![\w-])value\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s\"'>]+))",
+    re.IGNORECASE,
+)
+
+
+class MfaTokenScanner:
+    """Find the MFA form token in an HTML page fed in chunks."""
+
+    __slots__ = ("_position", "body")
+
+    def __init__(self) -> None:
+        """Initialize an empty scanner."""
+        self.body = bytearray()
+        self._position = 0
+
+    def feed(self, chunk: bytes) -> str | None:
+        """Add a chunk of the page, returning the token once it has been seen."""
+        self.body += chunk
+        match = _MFA_TOKEN_TAG.search(self.body, self._position)
+        if match is None:
+            # Tags end at the first ">", so only text after the last one can
+            # still be the start of the token input
+            self._position = max(self._position, self.body.rfind(b">") + 1)
+            return None
+        self._position = match.end()
+        if (value := _MFA_TOKEN_VALUE.search(match[0])) is None:
+            return None
+        token = next((group for group in value.groups() if group is not None), b"")
+        return html.unescape(token.decode())
+
+
+def generate_mfa_code(shared_secret: str, timestamp: float | None = None) -> str:
+    """Return the TOTP code of the MFA shared secret at a time, now by default."""
+    # Imported on first login, most startups reuse the stored credentials
+    import pyotp  # noqa: PLC0415
+
+    totp = pyotp.TOTP(shared_secret)
+    return totp.now() if timestamp is None else totp.at(timestamp)
+
+
+def totp_validity(timestamp: float) -> float:
+    """Return the seconds the TOTP code of a time stays valid for after it."""
+    return TOTP_STEP - timestamp % TOTP_STEP
+
+
+def parse_mfa_token(page: str) -> str | None:
+    """Find the MFA form token by parsing the whole page."""
+    # Only needed when the scanner does not recognise the page
+    from selectolax.parser import HTMLParser  # noqa: PLC0415
+
+    token_elem = HTMLParser(html=page).css_first(f"input#{MFA_TOKEN_ID}")
+    return token_elem.attributes.get("value") if token_elem else None
+
+
+async def async_read_mfa_token(response: aiohttp.ClientResponse) -> str | None:
+    """Read the MFA form token from the response, parsing no more than needed."""
+    scanner = MfaTokenScanner()
+    async for chunk in response.content.iter_any():
+        if (token := scanner.feed(chunk)) is not None:
+            # The rest of the page is left unread, releasing the response
+            # closes its connection rather than buffering the page to reuse it
+            return token
+    return parse_mfa_token(
+        scanner.body.decode(response.get_encoding(), errors="replace")
+    )
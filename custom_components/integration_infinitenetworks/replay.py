@@ -0,0 +1,251 @@
+"""Record and replay the API traffic of the Infinite Networks API client."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import time
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from custom_components.integration_infinitenetworks.api import json_loads
+from custom_components.integration_infinitenetworks.transport import (
+    InfinteNetworksTransport,
+)
+
+try:
+    from orjson import dumps as _json_dumps
+except ImportError:
+    from json import dumps
+
+    def _json_dumps(value: Any) -> bytes:
+        return dumps(value, separators=(",", ":")).encode()
+
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable, Iterator
+    from pathlib import Path
+
+FIXTURE_VERSION = 1
+REDACTED = "**REDACTED**"
+# Values that identify the account, the premises or its equipment
+SANITIZED_KEYS = frozenset(
+    {
+        "identifier",
+        "router_cpe_mac",
+        "ntu_cpe_mac",
+        "ntu_cpe_serial",
+        "hmac",
+        "user",
+        "username",
+        "email",
+        "name",
+        "address",
+        "phone",
+    }
+)
+# Response headers the client reads, the rest are dropped
+RECORDED_HEADERS = (
+    aiohttp.hdrs.CONTENT_TYPE,
+    aiohttp.hdrs.ETAG,
+    aiohttp.hdrs.LAST_MODIFIED,
+    aiohttp.hdrs.RETRY_AFTER,
+)
+
+
+class RecordedExchange(NamedTuple):
+    """A request and its response, without anything identifying the account."""
+
+    timestamp: float
+    elapsed: float
+    method: str
+    path: str
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+
+def sanitize(value: Any) -> Any:
+    """Return a copy of a decoded body with the identifying values redacted."""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if key in SANITIZED_KEYS else sanitize(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [sanitize(item) for item in value]
+    return value
+
+
+def sanitize_body(body: bytes) -> bytes:
+    """Redact the identifying values of a JSON body, dropping any other body."""
+    if not body:
+        return body
+    try:
+        return _json_dumps(sanitize(json_loads(body)))
+    except ValueError:
+        return b""
+
+
+class FixtureWriter:
+    """Write exchanges to a gzipped JSON lines fixture, one exchange per line."""
+
+    def __init__(self, path: Path) -> None:
+        """Open the fixture, writing its header."""
+        self._file = gzip.open(path, "wb")  # noqa: SIM115 Closed by close()
+        self._file.write(_json_dumps({"version": FIXTURE_VERSION}) + b"\n")
+        self._bodies: dict[tuple[str, str], bytes] = {}
+
+    def write(self, exchange: RecordedExchange) -> None:
+        """Append an exchange, leaving out a body equal to the last one of its URL."""
+        key = (exchange.method, exchange.path)
+        # Most polls return the same details, so unchanged bodies become null
+        body = None if self._bodies.get(key) == exchange.body else exchange.body
+        self._bodies[key] = exchange.body
+        self._file.write(
+            _json_dumps(
+                [
+                    round(exchange.timestamp, 3),
+                    round(exchange.elapsed, 4),
+                    exchange.method,
+                    exchange.path,
+                    exchange.status,
+                    exchange.headers,
+                    None if body is None else body.decode(),
+                ]
+            )
+            + b"\n"
+        )
+
+    def close(self) -> None:
+        """Flush and close the fixture."""
+        self._file.close()
+
+
+def read_fixture(path: Path) -> Iterator[RecordedExchange]:
+    """Read the exchanges of a fixture, restoring the unchanged bodies."""
+    bodies: dict[tuple[str, str], bytes] = {}
+    with gzip.open(path, "rb") as file:
+        header = json_loads(file.readline())
+        if header.get("version") != FIXTURE_VERSION:
+            msg = f"Unsupported fixture version {header.get('version')}"
+            raise ValueError(msg)
+        for line in file:
+            timestamp, elapsed, method, path_qs, status, headers, body = json_loads(
+                line
+            )
+            key = (method, path_qs)
+            if body is not None:
+                bodies[key] = body.encode()
+            yield RecordedExchange(
+                timestamp, elapsed, method, path_qs, status, headers, bodies[key]
+            )
+
+
+class RecordingTransport(InfinteNetworksTransport):
+    """Send requests over a session, recording the sanitized API exchanges."""
+
+    def __init__(
+        self, session: aiohttp.ClientSession, writer: FixtureWriter, api_url: str
+    ) -> None:
+        """Initialize the transport, recording the requests to the API URL only."""
+        super().__init__(session)
+        self.writer = writer
+        # The SSO login carries the password, MFA code and tokens, never record it
+        self._api_url = api_url
+
+    async def request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> tuple[aiohttp.ClientResponse, bytes]:
+        """Send a request, recording the exchange if it went to the API."""
+        start = time.monotonic()
+        response, body = await super().request(method, url, **kwargs)
+        if url.startswith(self._api_url):
+            self.writer.write(
+                RecordedExchange(
+                    timestamp=time.time(),
+                    elapsed=time.monotonic() - start,
+                    method=method.upper(),
+                    path=URL(url).path_qs,
+                    status=response.status,
+                    # The names are istr, which orjson refuses as keys
+                    headers={
+                        str(name): response.headers[name]
+                        for name in RECORDED_HEADERS
+                        if name in response.headers
+                    },
+                    body=sanitize_body(body),
+                )
+            )
+        return response, body
+
+
+class ReplayResponse:
+    """The parts of a response the client reads, served from a fixture."""
+
+    def __init__(self, exchange: RecordedExchange, url: URL) -> None:
+        """Initialize the response of a recorded exchange."""
+        self.status = exchange.status
+        self.headers = CIMultiDictProxy(CIMultiDict(exchange.headers))
+        self.url = self.real_url = url
+        self._method = exchange.method
+
+    def raise_for_status(self) -> None:
+        """Raise an error for a recorded error status."""
+        if self.status >= 400:  # noqa: PLR2004
+            raise aiohttp.ClientResponseError(
+                aiohttp.RequestInfo(self.url, self._method, self.headers, self.url),
+                (),
+                status=self.status,
+            )
+
+
+class ReplayTransport(InfinteNetworksTransport):
+    """Serve the requests from recorded exchanges, in the order they were recorded."""
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        exchanges: Iterable[RecordedExchange],
+        speed: float | None = 1.0,
+    ) -> None:
+        """Initialize the transport, speeding up the recorded latency, None for none."""
+        super().__init__(session)
+        self.speed = speed
+        self._exchanges: defaultdict[tuple[str, str], deque[RecordedExchange]] = (
+            defaultdict(deque)
+        )
+        for exchange in exchanges:
+            self._exchanges[exchange.method, exchange.path].append(exchange)
+
+    def remaining(self, method: str, path: str) -> int:
+        """Return the number of exchanges left for a request."""
+        return len(self._exchanges.get((method.upper(), path), ()))
+
+    @asynccontextmanager
+    async def stream(
+        self, method: str, url: str, **kwargs: Any
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Serve the next recorded exchange of the request as a stream."""
+        response, _body = await self.request(method, url, **kwargs)
+        yield response
+
+    async def request(
+        self, method: str, url: str, **_kwargs: Any
+    ) -> tuple[aiohttp.ClientResponse, bytes]:
+        """Serve the next recorded exchange of the request."""
+        request_url = URL(url)
+        recorded = self._exchanges.get((method.upper(), request_url.path_qs))
+        if not recorded:
+            msg = f"No recorded response for {method.upper()} {url}"
+            raise aiohttp.ClientConnectionError(msg)
+        exchange = recorded.popleft()
+        if self.speed:
+            await asyncio.sleep(exchange.elapsed / self.speed)
+        response: Any = ReplayResponse(exchange, request_url)
+        return response, exchange.body
@@ -0,0 +1,160 @@
+"""Retry and circuit breaker helpers for the Infinite Networks API client."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from enum import StrEnum
+from typing import Any
+
+
+class CircuitState(StrEnum):
+    """State of the circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Jittered exponential backoff used for idempotent requests."""
+
+    attempts: int = 3
+    backoff: float = 1.0
+    max_backoff: float = 30.0
+    jitter: float = 0.5
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Return the seconds to wait before retrying after the given attempt."""
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        delay = min(self.backoff * 2**attempt, self.max_backoff)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)  # noqa: S311
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+@dataclass
+class RetryStatistics:
+    """Counters describing how often and how long requests were retried."""
+
+    retries: int = 0
+    waited: float = 0.0
+    last_error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics for diagnostics."""
+        return {
+            "retries": self.retries,
+            "retry_wait_seconds": round(self.waited, 3),
+            "last_error": self.last_error,
+        }
+
+
+class CircuitBreaker:
+    """Stop calling the API after repeated failures, probing it when half open."""
+
+    def __init__(
+        self, failure_threshold: int = 5, reset_timeout: float = 300.0
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the state, moving to half open once the reset timeout passed."""
+        if (
+            self._state is CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self._reset_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent, only one probe when half open."""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        now = time.monotonic()
+        # A probe that never reported back, e.g. cancelled, must not block forever
+        if state is CircuitState.HALF_OPEN and (
+            not self._probing or now - self._probe_started >= self._reset_timeout
+        ):
+            self._probing = True
+            self._probe_started = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after the API responded."""
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold or a failed probe."""
+        self._failures += 1
+        if (
+            self._state is CircuitState.HALF_OPEN
+            or self._failures >= self._failure_threshold
+        ):
+            if self._state is not CircuitState.OPEN:
+                self.times_opened += 1
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+            self._probing = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "times_opened": self.times_opened,
+        }
+
+
+class TokenBucket:
+    """Limit the rate of requests, allowing bursts up to the capacity."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Initialize a full bucket refilling at rate tokens per second."""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
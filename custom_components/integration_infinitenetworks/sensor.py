@@ -2,23 +2,44 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import time
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
+    SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import UnitOfDataRate
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfDataRate,
+    UnitOfTime,
+)
+from homeassistant.core import callback
 
-from .entity import InfinteNetworksEntity
+from .analytics import ANALYTICS_DIRECTIONS
+from .entity import InfinteNetworksAccountEntity, InfinteNetworksEntity
+from .history import HISTORY_METRICS, HISTORY_WINDOWS
+from .resilience import CircuitState
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import timedelta
+
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.typing import StateType
 
+    from .analytics import DirectionQuality, LineQuality
+    from .api import InfiniteService, InfinteNetworksApiClient, VisionDetails
     from .coordinator import InfinteNetworksDataUpdateCoordinator
     from .data import InfinteNetworksConfigEntry
+    from .history import WindowAggregate
 
 ENTITY_DESCRIPTIONS = (
     SensorEntityDescription(
@@ -28,6 +49,7 @@ ENTITY_DESCRIPTIONS = (
     SensorEntityDescription(
         key="last_status_change",  #: "2025-06-19T12:44:32.000+00:00",
         name="Last status change",
+        device_class=SensorDeviceClass.TIMESTAMP,
     ),
     SensorEntityDescription(
         key="router_cpe_mac",  #: "60:22:32:9c:4e:20",
@@ -80,36 +102,405 @@ ENTITY_DESCRIPTIONS = (
 )
 
 
+@dataclass(frozen=True, kw_only=True)
+class InfinteNetworksHistorySensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor aggregating the line rate history over a window."""
+
+    metric: str
+    window: timedelta
+
+
+HISTORY_ENTITY_DESCRIPTIONS = tuple(
+    InfinteNetworksHistorySensorEntityDescription(
+        key=f"{entity_description.key}_{window_name}_mean",
+        name=f"{entity_description.name} {window_name} mean",
+        native_unit_of_measurement=UnitOfDataRate.KILOBITS_PER_SECOND,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        entity_registry_enabled_default=window_name == "24h",
+        metric=entity_description.key,
+        window=window,
+    )
+    for entity_description in ENTITY_DESCRIPTIONS
+    if entity_description.key in HISTORY_METRICS
+    for window_name, window in HISTORY_WINDOWS.items()
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class InfinteNetworksAnalyticsSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor reading its value from the line quality analytics."""
+
+    value_fn: Callable[[LineQuality], StateType]
+    attributes_fn: Callable[[LineQuality], dict[str, Any] | None] | None = None
+
+
+def _direction_fn(
+    direction: str, fn: Callable[[DirectionQuality], Any]
+) -> Callable[[LineQuality], Any]:
+    """Apply a function to the quality of one direction, None without samples."""
+    getter = attrgetter(direction)
+
+    def _fn(quality: LineQuality) -> Any:
+        direction_quality = getter(quality)
+        return fn(direction_quality) if direction_quality else None
+
+    return _fn
+
+
+def _percent(ratio: float | None) -> float | None:
+    return ratio * 100 if ratio is not None else None
+
+
+ANALYTICS_ENTITY_DESCRIPTIONS = (
+    *(
+        entity_description
+        for direction in ANALYTICS_DIRECTIONS
+        for entity_description in (
+            InfinteNetworksAnalyticsSensorEntityDescription(
+                key=f"sync_efficiency_{direction}",
+                name=f"Sync efficiency {direction}",
+                native_unit_of_measurement=PERCENTAGE,
+                state_class=SensorStateClass.MEASUREMENT,
+                suggested_display_precision=1,
+                value_fn=_direction_fn(
+                    direction, lambda quality: _percent(quality.efficiency)
+                ),
+                attributes_fn=_direction_fn(
+                    direction,
+                    lambda quality: {"mean_24h": _percent(quality.mean_efficiency)},
+                ),
+            ),
+            InfinteNetworksAnalyticsSensorEntityDescription(
+                key=f"actual_line_rate_{direction}_24h_median",
+                name=f"Actual line rate {direction} 24h median",
+                native_unit_of_measurement=UnitOfDataRate.KILOBITS_PER_SECOND,
+                state_class=SensorStateClass.MEASUREMENT,
+                suggested_display_precision=0,
+                entity_registry_enabled_default=False,
+                value_fn=_direction_fn(direction, attrgetter("p50")),
+                attributes_fn=_direction_fn(
+                    direction, lambda quality: {"p5": quality.p5, "p95": quality.p95}
+                ),
+            ),
+            InfinteNetworksAnalyticsSensorEntityDescription(
+                key=f"actual_line_rate_{direction}_trend",
+                name=f"Actual line rate {direction} trend",
+                native_unit_of_measurement=f"{UnitOfDataRate.KILOBITS_PER_SECOND}/d",
+                state_class=SensorStateClass.MEASUREMENT,
+                suggested_display_precision=0,
+                value_fn=_direction_fn(direction, attrgetter("slope")),
+            ),
+        )
+    ),
+    InfinteNetworksAnalyticsSensorEntityDescription(
+        key="retrains_24h",
+        name="Retrains 24h",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=attrgetter("retrains"),
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class InfinteNetworksDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a diagnostic sensor reading its value from the API client."""
+
+    value_fn: Callable[[InfinteNetworksApiClient], StateType]
+    attributes_fn: Callable[[InfinteNetworksApiClient], dict[str, Any]] | None = None
+
+
+DIAGNOSTIC_ENTITY_DESCRIPTIONS = (
+    InfinteNetworksDiagnosticSensorEntityDescription(
+        key="circuit_breaker",
+        name="API circuit breaker",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=SensorDeviceClass.ENUM,
+        options=[state.value for state in CircuitState],
+        value_fn=lambda client: client.circuit_breaker.state,
+        attributes_fn=lambda client: {
+            **client.retry_statistics.as_dict(),
+            **client.circuit_breaker.as_dict(),
+        },
+    ),
+    InfinteNetworksDiagnosticSensorEntityDescription(
+        key="logins",
+        name="SSO logins",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: client.instrumentation.counter_total("logins"),
+    ),
+    InfinteNetworksDiagnosticSensorEntityDescription(
+        key="hmac_refreshes",
+        name="HMAC refreshes",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: client.instrumentation.counter_total("hmac_refreshes"),
+    ),
+    InfinteNetworksDiagnosticSensorEntityDescription(
+        key="cache_hits",
+        name="API cache hits",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: client.instrumentation.counter_total("cache_hits"),
+    ),
+    InfinteNetworksDiagnosticSensorEntityDescription(
+        key="api_errors",
+        name="API errors",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: sum(
+            counter.total for counter in client.instrumentation.errors.values()
+        ),
+        attributes_fn=lambda client: {
+            name: counter.total
+            for name, counter in client.instrumentation.errors.items()
+        },
+    ),
+    InfinteNetworksDiagnosticSensorEntityDescription(
+        key="details_latency",
+        name="API details latency",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda client: (
+            stats.as_dict()["last_ms"]
+            if (stats := client.instrumentation.spans.get("details"))
+            else None
+        ),
+        attributes_fn=lambda client: {
+            name: stats.as_dict()
+            for name, stats in client.instrumentation.spans.items()
+        },
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
     entry: InfinteNetworksConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
+    coordinator = entry.runtime_data.coordinator
     async_add_entities(
         InfinteNetworksSensor(
-            coordinator=entry.runtime_data.coordinator,
+            coordinator=coordinator,
+            infinite_service=infinite_service,
             entity_description=entity_description,
         )
+        for infinite_service in coordinator.services
         for entity_description in ENTITY_DESCRIPTIONS
     )
+    async_add_entities(
+        InfinteNetworksHistorySensor(
+            coordinator=coordinator,
+            infinite_service=infinite_service,
+            entity_description=entity_description,
+        )
+        for infinite_service in coordinator.services
+        for entity_description in HISTORY_ENTITY_DESCRIPTIONS
+    )
+    async_add_entities(
+        InfinteNetworksAnalyticsSensor(
+            coordinator=coordinator,
+            infinite_service=infinite_service,
+            entity_description=entity_description,
+        )
+        for infinite_service in coordinator.services
+        for entity_description in ANALYTICS_ENTITY_DESCRIPTIONS
+    )
+    async_add_entities(
+        InfinteNetworksDiagnosticSensor(
+            coordinator=coordinator,
+            entity_description=entity_description,
+        )
+        for entity_description in DIAGNOSTIC_ENTITY_DESCRIPTIONS
+    )
 
 
-class InfinteNetworksSensor(InfinteNetworksEntity, SensorEntity):
+class InfinteNetworksSensor(InfinteNetworksEntity, RestoreSensor):
     """integration_infinitenetworks Sensor class."""
 
+    _written_state: tuple[Any, ...] | None = None
+
     def __init__(
         self,
         coordinator: InfinteNetworksDataUpdateCoordinator,
+        infinite_service: InfiniteService,
         entity_description: SensorEntityDescription,
     ) -> None:
         """Initialize the sensor class."""
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator,
+            infinite_service,
+            context=(infinite_service.id, entity_description.key),
+        )
         self.entity_description = entity_description
         if self._attr_unique_id and entity_description.key:
             self._attr_unique_id += f"_{entity_description.key}"
+        self._value_fn: Callable[[VisionDetails], Any] = attrgetter(
+            entity_description.key
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last state until the first refresh has finished."""
+        await super().async_added_to_hass()
+        if self.coordinator.data is not None:
+            self._update_native_value()
+        elif last_sensor_data := await self.async_get_last_sensor_data():
+            self._attr_native_value = last_sensor_data.native_value
+        self._written_state = self._state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update the value, writing the state only when it changed."""
+        self._update_native_value()
+        if (state := self._state()) == self._written_state:
+            return
+        self._written_state = state
+        super()._handle_coordinator_update()
+
+    def _update_native_value(self) -> None:
+        """Read the value from the typed details of the latest update."""
+        if self.coordinator.data is None:
+            # The first refresh failed, keep the restored value
+            return
+        details = self.coordinator.data.get(self.infinite_service.id)
+        self._attr_native_value = self._value_fn(details) if details else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag a value from before the last update, or from the last run."""
+        return {"stale": True} if self.coordinator.stale else None
+
+    def _state(self) -> tuple[Any, ...]:
+        """Return what the state written to Home Assistant depends on."""
+        return (self.available, self.native_value, self.extra_state_attributes)
+
+    @property
+    def available(self) -> bool:
+        """Return True if there is a current or restored value to show."""
+        if self.coordinator.data is None:
+            return (
+                self.coordinator.last_update_success
+                and self._attr_native_value is not None
+            )
+        return super().available
+
+
+class InfinteNetworksHistorySensor(InfinteNetworksSensor):
+    """integration_infinitenetworks line rate history Sensor class."""
+
+    entity_description: InfinteNetworksHistorySensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: InfinteNetworksDataUpdateCoordinator,
+        infinite_service: InfiniteService,
+        entity_description: InfinteNetworksHistorySensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator, infinite_service, entity_description)
+        # The window moves with every update, even when the line rate is
+        # unchanged, and the coordinator notifies context-less entities of each
+        self.coordinator_context = None
+
+    def _update_native_value(self) -> None:
+        """Leave the value to the history, which was recorded with the update."""
+
+    def _aggregate(self) -> WindowAggregate | None:
+        """Return the aggregate of the window from the in-memory history."""
+        return self.coordinator.config_entry.runtime_data.history.aggregate(
+            self.infinite_service.id,
+            self.entity_description.metric,
+            int(self.entity_description.window.total_seconds()),
+            int(time.time()),
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the mean of the window."""
+        aggregate = self._aggregate()
+        return aggregate.mean if aggregate else None
 
     @property
-    def native_value(self) -> str | None:
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the minimum and maximum of the window."""
+        aggregate = self._aggregate()
+        if aggregate is None:
+            return None
+        return {"min": aggregate.minimum, "max": aggregate.maximum}
+
+
+class InfinteNetworksAnalyticsSensor(InfinteNetworksSensor):
+    """integration_infinitenetworks line quality analytics Sensor class."""
+
+    entity_description: InfinteNetworksAnalyticsSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: InfinteNetworksDataUpdateCoordinator,
+        infinite_service: InfiniteService,
+        entity_description: InfinteNetworksAnalyticsSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator, infinite_service, entity_description)
+        # The window moves with every update, even when the line rate is
+        # unchanged, and the coordinator notifies context-less entities of each
+        self.coordinator_context = None
+
+    def _update_native_value(self) -> None:
+        """Leave the value to the analytics, which were recorded with the update."""
+
+    def _quality(self) -> LineQuality:
+        """Return the line quality of the service, computed once per update."""
+        return self.coordinator.config_entry.runtime_data.analytics.quality(
+            self.infinite_service.id, int(time.time())
+        )
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the value derived from the line quality."""
+        return self.entity_description.value_fn(self._quality())
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the attributes derived from the line quality."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self._quality())
+
+
+class InfinteNetworksDiagnosticSensor(InfinteNetworksAccountEntity, SensorEntity):
+    """integration_infinitenetworks diagnostic Sensor class."""
+
+    entity_description: InfinteNetworksDiagnosticSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: InfinteNetworksDataUpdateCoordinator,
+        entity_description: InfinteNetworksDiagnosticSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator)
+        self.entity_description = entity_description
+        self._attr_unique_id = f"{self._attr_unique_id}_{entity_description.key}"
+
+    @property
+    def native_value(self) -> StateType:
         """Return the native value of the sensor."""
-        return self.coordinator.data.get("details").get(self.entity_description.key)  # pyright: ignore[reportOptionalMemberAccess]
+        return self.entity_description.value_fn(
+            self.coordinator.config_entry.runtime_data.client
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the diagnostic attributes."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(
+            self.coordinator.config_entry.runtime_data.client
+        )
@@ -0,0 +1,96 @@
+"""Last good details snapshot for integration_infinitenetworks."""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from homeassistant.helpers.storage import Store
+
+from .api import InfiniteService, VisionDetails
+from .const import DOMAIN, SNAPSHOT_MAX_AGE, SNAPSHOT_VERSION
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+class DetailsSnapshot(NamedTuple):
+    """The services and their details as of the last successful update."""
+
+    # Seconds since the epoch the details were fetched
+    fetched: float
+    services: list[InfiniteService]
+    data: dict[int, VisionDetails]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the snapshot in its compact stored form, one row per service."""
+        return {
+            "fetched": self.fetched,
+            "fields": VisionDetails.__slots__,
+            "services": [
+                [
+                    service.id,
+                    service.client_id,
+                    service.identifier,
+                    [_as_stored(value) for value in _values(details)]
+                    if (details := self.data.get(service.id))
+                    else None,
+                ]
+                for service in self.services
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, stored: dict[str, Any]) -> DetailsSnapshot:
+        """Load a snapshot, decoding the details as if they came from the API."""
+        fields = stored["fields"]
+        services = []
+        data = {}
+        for service_id, client_id, identifier, values in stored["services"]:
+            services.append(
+                InfiniteService(
+                    identifier=identifier, id=service_id, client_id=client_id
+                )
+            )
+            if values is not None:
+                data[service_id] = VisionDetails(dict(zip(fields, values, strict=True)))
+        return cls(stored["fetched"], services, data)
+
+
+def _values(details: VisionDetails) -> list[Any]:
+    return [getattr(details, field) for field in VisionDetails.__slots__]
+
+
+def _as_stored(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def async_load_snapshot(
+    hass: HomeAssistant, entry_id: str
+) -> DetailsSnapshot | None:
+    """Load the snapshot of a config entry, None if missing or too old to show."""
+    stored = await _store(hass, entry_id).async_load()
+    if stored is None:
+        return None
+    snapshot = DetailsSnapshot.from_dict(stored)
+    if time.time() - snapshot.fetched > SNAPSHOT_MAX_AGE.total_seconds():
+        return None
+    return snapshot
+
+
+async def async_save_snapshot(
+    hass: HomeAssistant, entry_id: str, snapshot: DetailsSnapshot
+) -> None:
+    """Save the snapshot of a config entry."""
+    await _store(hass, entry_id).async_save(snapshot.as_dict())
+
+
+async def async_remove_snapshot(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the snapshot of a config entry."""
+    await _store(hass, entry_id).async_remove()
+
+
+def _store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    # The details identify the equipment at the premises, like the credentials
+    return Store(hass, SNAPSHOT_VERSION, f"{DOMAIN}.snapshot.{entry_id}", private=True)
@@ -0,0 +1,102 @@
+"""Credential storage for integration_infinitenetworks."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.helpers.storage import Store
+from slugify import slugify
+
+from .api import InfiniteService, InfinteCredentials, InfinteHmac, InfinteServiceCache
+from .const import STORAGE_KEY, STORAGE_VERSION
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+class InfinteNetworksCredentialStore:
+    """Persist the credentials and discovered services of an account."""
+
+    def __init__(self, hass: HomeAssistant, username: str) -> None:
+        """Initialize the store for an account."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass,
+            STORAGE_VERSION,
+            f"{STORAGE_KEY}.{slugify(username)}",
+            private=True,
+        )
+        self._data: dict[str, Any] | None = None
+
+    async def _async_load_data(self) -> dict[str, Any]:
+        """Load the stored data once and keep it in memory."""
+        if self._data is None:
+            self._data = await self._store.async_load() or {}
+        return self._data
+
+    async def async_load(self) -> InfinteCredentials | None:
+        """Load the persisted credentials."""
+        data = await self._async_load_data()
+        if "hmac" not in data:
+            return None
+
+        hmac: InfinteHmac = {
+            **data["hmac"],
+            "expires_date": datetime.fromisoformat(data["hmac"]["expires_date"]),
+        }
+        return InfinteCredentials(
+            hmac=hmac,
+            client_ids=data["client_ids"],
+            cookies=data["cookies"],
+        )
+
+    async def async_save(self, credentials: InfinteCredentials) -> None:
+        """Persist the credentials."""
+        data = await self._async_load_data()
+        data.update(
+            {
+                "hmac": {
+                    **credentials["hmac"],
+                    "expires_date": credentials["hmac"]["expires_date"].isoformat(),
+                },
+                "client_ids": credentials["client_ids"],
+                "cookies": credentials["cookies"],
+            }
+        )
+        await self._store.async_save(data)
+
+    async def async_load_services(self) -> dict[int, InfinteServiceCache]:
+        """Load the persisted service discovery cache."""
+        data = await self._async_load_data()
+        return {
+            int(client_id): InfinteServiceCache(
+                fetched=datetime.fromisoformat(cache["fetched"]),
+                services=[InfiniteService(**service) for service in cache["services"]],
+            )
+            for client_id, cache in data.get("services", {}).items()
+        }
+
+    async def async_save_services(
+        self, services: dict[int, InfinteServiceCache]
+    ) -> None:
+        """Persist the service discovery cache."""
+        data = await self._async_load_data()
+        data["services"] = {
+            str(client_id): {
+                "fetched": cache["fetched"].isoformat(),
+                "services": [
+                    {
+                        "identifier": service.identifier,
+                        "id": service.id,
+                        "client_id": service.client_id,
+                    }
+                    for service in cache["services"]
+                ],
+            }
+            for client_id, cache in services.items()
+        }
+        await self._store.async_save(data)
+
+    async def async_remove(self) -> None:
+        """Remove the persisted credentials."""
+        await self._store.async_remove()
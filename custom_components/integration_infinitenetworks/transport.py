@@ -0,0 +1,67 @@
+"""HTTP transport of the Infinite Networks API client."""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+from custom_components.integration_infinitenetworks.const import (
+    DEFAULT_MAX_CONCURRENCY,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+)
+
+if TYPE_CHECKING:
+    import ssl
+    from collections.abc import AsyncIterator, Mapping
+
+
+def create_session(
+    *,
+    limit_per_host: int = DEFAULT_MAX_CONCURRENCY,
+    cookie_jar: aiohttp.abc.AbstractCookieJar | None = None,
+    trace_configs: list[aiohttp.TraceConfig] | None = None,
+    ssl_context: ssl.SSLContext | bool = True,
+    headers: Mapping[str, str] | None = None,
+) -> aiohttp.ClientSession:
+    """Return a session with a keep-alive connector for the SSO and API hosts."""
+    connector = aiohttp.TCPConnector(
+        # One SSO host and one API host
+        limit=2 * limit_per_host,
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        ssl=ssl_context,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        cookie_jar=cookie_jar,
+        trace_configs=trace_configs,
+        headers=headers,
+    )
+
+
+class InfinteNetworksTransport:
+    """Send requests over a session, always releasing the responses."""
+
+    def __init__(self, session: aiohttp.ClientSession) -> None:
+        """Initialize the transport."""
+        self.session = session
+
+    @asynccontextmanager
+    async def stream(
+        self, method: str, url: str, **kwargs: Any
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Send a request, releasing the response when the context exits."""
+        async with self.session.request(method, url, **kwargs) as response:
+            yield response
+
+    async def request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> tuple[aiohttp.ClientResponse, bytes]:
+        """Send a request, returning the released response and its body."""
+        async with self.stream(method, url, **kwargs) as response:
+            body = await response.read()
+        return response, body
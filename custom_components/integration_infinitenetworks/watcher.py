@@ -0,0 +1,134 @@
+"""Fast polling of the service state for integration_infinitenetworks."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .api import InfinteNetworksApiClientError
+from .const import EVENT_SERVICE_STATE_CHANGED, FLEET_SLOT_SIZE, LOGGER
+from .coordinator import InfinteNetworksFleetCoordinator
+from .fleet import FleetScheduler
+
+if TYPE_CHECKING:
+    from datetime import datetime, timedelta
+
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+    from .api import InfiniteService, InfiniteServiceState
+    from .data import InfinteNetworksConfigEntry
+
+
+class InfinteNetworksStateWatcher:
+    """Poll just the service state, and react quickly when it changes."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: InfinteNetworksConfigEntry,
+        interval: timedelta,
+    ) -> None:
+        """Initialize the watcher."""
+        self.hass = hass
+        self.entry = entry
+        self.interval = interval
+        self._states: dict[int, str | None] = {}
+        self._polling = False
+        # Each state poll fetches the full details, so in fleet mode a tick
+        # checks one slot of services like the coordinator, not all of them
+        self._scheduler = (
+            FleetScheduler(FLEET_SLOT_SIZE)
+            if isinstance(
+                entry.runtime_data.coordinator, InfinteNetworksFleetCoordinator
+            )
+            else None
+        )
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start polling, returning a callback that stops it."""
+        return async_track_time_interval(
+            self.hass,
+            self._async_poll,
+            self.interval,
+            name=f"{self.entry.title} state watcher",
+        )
+
+    async def _async_poll(self, _now: datetime) -> None:
+        """Poll the state of every service, skipping a tick while one is running."""
+        if self._polling:
+            return
+        self._polling = True
+        try:
+            await self._async_poll_services()
+        finally:
+            self._polling = False
+
+    async def _async_poll_services(self) -> None:
+        coordinator = self.entry.runtime_data.coordinator
+        services = coordinator.services
+        if self._scheduler:
+            services = self._scheduler.due(services, self._states)
+            self._scheduler.advance()
+        client = self.entry.runtime_data.client
+        results = await asyncio.gather(
+            *(client.async_get_service_state(service) for service in services),
+            return_exceptions=True,
+        )
+
+        changed = set()
+        for service, result in zip(services, results, strict=True):
+            if isinstance(result, InfinteNetworksApiClientError):
+                LOGGER.debug("Polling the state of %s failed: %s", service.id, result)
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            if self._async_update_state(service, result):
+                changed.add(service.id)
+
+        if changed:
+            if isinstance(coordinator, InfinteNetworksFleetCoordinator):
+                # A fleet refresh polls one slot, so add the changed services
+                coordinator.scheduler.retry |= changed
+            # Poll the full details fast until they settle again
+            coordinator.async_poll_fast()
+            await coordinator.async_request_refresh()
+
+    @callback
+    def _async_update_state(
+        self, service: InfiniteService, state: InfiniteServiceState
+    ) -> bool:
+        """Remember the state, firing an event if it changed."""
+        if service.id in self._states:
+            old_state = self._states[service.id]
+        else:
+            # The first poll compares against the last full update
+            details = (self.entry.runtime_data.coordinator.data or {}).get(service.id)
+            old_state = details.service_state if details else state.service_state
+        self._states[service.id] = state.service_state
+        if old_state == state.service_state:
+            return False
+
+        LOGGER.info(
+            "Service %s changed state from %s to %s",
+            service.identifier,
+            old_state,
+            state.service_state,
+        )
+        self.hass.bus.async_fire(
+            EVENT_SERVICE_STATE_CHANGED,
+            {
+                "entry_id": self.entry.entry_id,
+                "service_id": service.id,
+                "identifier": service.identifier,
+                "old_state": old_state,
+                "new_state": state.service_state,
+                "last_status_change": state.last_status_change.isoformat()
+                if state.last_status_change
+                else None,
+            },
+        )
+        return True
@@ -0,0 +1 @@
+"""Tests of the Infinite Networks integration."""
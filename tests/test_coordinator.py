@@ -0,0 +1,141 @@
+"""Tests of the Infinite Networks coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.integration_infinitenetworks.analytics import (
+    LineQualityAnalytics,
+)
+from custom_components.integration_infinitenetworks.api import (
+    InfiniteService,
+    VisionDetails,
+)
+from custom_components.integration_infinitenetworks.const import (
+    DOMAIN,
+    LOGGER,
+)
+from custom_components.integration_infinitenetworks.coordinator import (
+    InfinteNetworksDataUpdateCoordinator,
+)
+from custom_components.integration_infinitenetworks.history import (
+    LineRateHistory,
+)
+from custom_components.integration_infinitenetworks.snapshot import (
+    DetailsSnapshot,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+SERVICE = InfiniteService(identifier="ABC123", id=7, client_id=1)
+DETAILS = {
+    "actual_line_rate_down": 98000,
+    "actual_line_rate_up": 19000,
+    "service_state": "up",
+}
+
+
+class StubClient:
+    """Return the same services and details on every poll."""
+
+    async def async_get_services(self) -> list[InfiniteService]:
+        """Return the one service."""
+        return [SERVICE]
+
+    async def async_get_all_vision_details(
+        self, services: list[InfiniteService]
+    ) -> dict[int, VisionDetails]:
+        """Return the details of the snapshot, decoded anew."""
+        return {service.id: VisionDetails(DETAILS) for service in services}
+
+
+def _coordinator(hass: HomeAssistant) -> InfinteNetworksDataUpdateCoordinator:
+    """Return a coordinator of the stub client, notified only of changes."""
+    coordinator = InfinteNetworksDataUpdateCoordinator(
+        hass,
+        LOGGER,
+        name=DOMAIN,
+        min_interval=timedelta(minutes=5),
+        max_interval=timedelta(minutes=60),
+        always_update=False,
+    )
+    history = LineRateHistory()
+    # Only what the coordinator reads from the config entry
+    coordinator.config_entry = SimpleNamespace(
+        entry_id="test",
+        domain=DOMAIN,
+        title="test",
+        pref_disable_polling=False,
+        runtime_data=SimpleNamespace(
+            client=StubClient(),
+            history=history,
+            analytics=LineQualityAnalytics(history),
+        ),
+    )
+    return coordinator
+
+
+async def _restore_and_refresh(config_dir: Path) -> list[bool]:
+    """Restore a snapshot, refresh with the same data and note the stale flags."""
+    hass = HomeAssistant(str(config_dir))
+    coordinator = _coordinator(hass)
+    coordinator.async_restore_snapshot(
+        DetailsSnapshot(
+            time.time() - 60, [SERVICE], {SERVICE.id: VisionDetails(DETAILS)}
+        )
+    )
+    stale_flags = [coordinator.stale]
+    unsubscribe = coordinator.async_add_listener(
+        lambda: stale_flags.append(coordinator.stale)
+    )
+    try:
+        await coordinator.async_refresh()
+        # Let the batched listener notification run
+        await asyncio.sleep(0)
+    finally:
+        unsubscribe()
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+    return stale_flags
+
+
+async def _refresh_unchanged(config_dir: Path) -> tuple[int, int]:
+    """Refresh twice with the same data, counting the listener calls."""
+    hass = HomeAssistant(str(config_dir))
+    coordinator = _coordinator(hass)
+    calls = {None: 0, "service_state": 0}
+    unsubscribes = [
+        coordinator.async_add_listener(
+            lambda context=context: calls.__setitem__(context, calls[context] + 1),
+            None if context is None else (SERVICE.id, context),
+        )
+        for context in calls
+    ]
+    try:
+        await coordinator.async_refresh()
+        await asyncio.sleep(0)
+        await coordinator.async_refresh()
+        await asyncio.sleep(0)
+    finally:
+        for unsubscribe in unsubscribes:
+            unsubscribe()
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+    return calls[None], calls["service_state"]
+
+
+def test_refresh_equal_to_snapshot_clears_stale(tmp_path: Path) -> None:
+    """A first refresh returning the snapshot's data still notifies the entities."""
+    assert asyncio.run(_restore_and_refresh(tmp_path)) == [True, False]
+
+
+def test_unchanged_refresh_notifies_context_less_listeners(tmp_path: Path) -> None:
+    """Windowed entities update on every refresh, the others only on changes."""
+    assert asyncio.run(_refresh_unchanged(tmp_path)) == (2, 1)
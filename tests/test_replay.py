@@ -0,0 +1,79 @@
+"""Tests of recording and replaying the API traffic."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from custom_components.integration_infinitenetworks import replay
+from custom_components.integration_infinitenetworks.replay import (
+    REDACTED,
+    FixtureWriter,
+    RecordingTransport,
+    ReplayTransport,
+    read_fixture,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+SERVICES_PATH = "/api/incontrol/client/1/services"
+SERVICES = [{"id": 7, "identifier": "ABC123", "status": "active"}]
+
+
+async def _record(path: Path) -> None:
+    """Record two polls of the services and a login to the SSO host."""
+
+    async def services(_request: web.Request) -> web.Response:
+        return web.json_response(SERVICES, headers={aiohttp.hdrs.ETAG: '"1"'})
+
+    app = web.Application()
+    app.router.add_get(SERVICES_PATH, services)
+    app.router.add_post("/login", services)
+    writer = FixtureWriter(path)
+    async with TestServer(app) as server, aiohttp.ClientSession() as session:
+        transport = RecordingTransport(session, writer, str(server.make_url("/api/")))
+        for _ in range(2):
+            await transport.request("get", str(server.make_url(SERVICES_PATH)))
+        await transport.request("post", str(server.make_url("/login")))
+    writer.close()
+
+
+async def _replay(path: Path) -> list[tuple[int, str | None, bytes]]:
+    """Replay the recorded polls of the services."""
+    async with aiohttp.ClientSession() as session:
+        transport = ReplayTransport(session, read_fixture(path), speed=None)
+        assert transport.remaining("GET", SERVICES_PATH) == 2  # noqa: PLR2004
+        assert transport.remaining("POST", "/login") == 0
+        replayed = []
+        for _ in range(2):
+            response, body = await transport.request(
+                "get", f"https://api.invalid{SERVICES_PATH}"
+            )
+            replayed.append(
+                (response.status, response.headers.get(aiohttp.hdrs.ETAG), body)
+            )
+        return replayed
+
+
+@pytest.mark.parametrize("encoder", ["default", "orjson"])
+def test_record_and_replay(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, encoder: str
+) -> None:
+    """Recorded API exchanges replay sanitized, with their headers."""
+    if encoder == "orjson":
+        orjson = pytest.importorskip("orjson")
+        monkeypatch.setattr(replay, "_json_dumps", orjson.dumps)
+    path = tmp_path / "services.jsonl.gz"
+
+    asyncio.run(_record(path))
+    replayed = asyncio.run(_replay(path))
+
+    body = replay.json_loads(replayed[0][2])
+    assert body == [{"id": 7, "identifier": REDACTED, "status": "active"}]
+    assert replayed == [(200, '"1"', replayed[0][2])] * 2
@@ -0,0 +1,114 @@
+"""Tests of the Infinite Networks service state watcher."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.integration_infinitenetworks.analytics import (
+    LineQualityAnalytics,
+)
+from custom_components.integration_infinitenetworks.api import (
+    InfiniteService,
+    InfiniteServiceState,
+    VisionDetails,
+)
+from custom_components.integration_infinitenetworks.const import (
+    DOMAIN,
+    FLEET_SLOT_SIZE,
+    LOGGER,
+)
+from custom_components.integration_infinitenetworks.coordinator import (
+    InfinteNetworksFleetCoordinator,
+)
+from custom_components.integration_infinitenetworks.history import (
+    LineRateHistory,
+)
+from custom_components.integration_infinitenetworks.watcher import (
+    InfinteNetworksStateWatcher,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# Two slots, so a fleet refresh polls half of the services
+SERVICES = [
+    InfiniteService(identifier=f"INF{service_id}", id=service_id, client_id=1)
+    for service_id in range(2 * FLEET_SLOT_SIZE)
+]
+
+
+class StubClient:
+    """Serve the state of every service, recording the details polled."""
+
+    def __init__(self) -> None:
+        """Start with every service up."""
+        self.states = {service.id: "up" for service in SERVICES}
+        self.polled: list[int] = []
+
+    async def async_get_services(self) -> list[InfiniteService]:
+        """Return the services."""
+        return SERVICES
+
+    async def async_get_vision_details(self, service: InfiniteService) -> VisionDetails:
+        """Return the details of a service with its current state."""
+        self.polled.append(service.id)
+        return VisionDetails({"service_state": self.states[service.id]})
+
+    async def async_get_service_state(
+        self, service: InfiniteService
+    ) -> InfiniteServiceState:
+        """Return the current state of a service."""
+        return InfiniteServiceState(self.states[service.id], None)
+
+
+async def _change_state(config_dir: Path) -> tuple[str | None, list[int]]:
+    """Change the state of a service outside the next slot and watch for it."""
+    hass = HomeAssistant(str(config_dir))
+    client = StubClient()
+    coordinator = InfinteNetworksFleetCoordinator(
+        hass,
+        LOGGER,
+        name=DOMAIN,
+        min_interval=timedelta(minutes=5),
+        max_interval=timedelta(minutes=60),
+        always_update=False,
+    )
+    history = LineRateHistory()
+    # Only what the coordinator and watcher read from the config entry
+    entry = coordinator.config_entry = SimpleNamespace(
+        entry_id="test",
+        domain=DOMAIN,
+        title="test",
+        pref_disable_polling=False,
+        runtime_data=SimpleNamespace(
+            client=client,
+            coordinator=coordinator,
+            history=history,
+            analytics=LineQualityAnalytics(history),
+        ),
+    )
+    watcher = InfinteNetworksStateWatcher(hass, entry, timedelta(minutes=1))
+    try:
+        # The first refresh polls every service, the next one the second slot
+        await coordinator.async_refresh()
+        client.polled.clear()
+        client.states[SERVICES[0].id] = "down"
+        await watcher._async_poll(dt_util.utcnow())  # noqa: SLF001
+    finally:
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+    return coordinator.data[SERVICES[0].id].service_state, client.polled
+
+
+def test_fleet_state_change_refreshes_the_changed_service(tmp_path: Path) -> None:
+    """A state change refetches the service, whichever slot it is in."""
+    service_state, polled = asyncio.run(_change_state(tmp_path))
+    assert service_state == "down"
+    assert SERVICES[0].id in polled
+    assert len(polled) == FLEET_SLOT_SIZE + 1